@@ -6,10 +6,12 @@ Analyzes YARA rule generation performance across different AI models
 
 import json
 import pandas as pd
+import matplotlib
+# Headless backend: skips the tk/qt probe at import and works in batch/CI
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import numpy as np
 from datetime import datetime
-from collections import defaultdict
 import warnings
 import sys
 import os
@@ -21,10 +23,24 @@ try:
 except:
     plt.style.use('ggplot')
 
+# Aggressively simplify paths; the output is a raster PNG so nothing is lost
+plt.rcParams['path.simplify'] = True
+plt.rcParams['path.simplify_threshold'] = 1.0
+
+# orjson parses large result files several times faster than stdlib json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
 def load_data(filename='commercial_model_comparison_fused.json'):
     """Load the JSON data"""
-    with open(filename, 'r') as f:
-        return json.load(f)
+    with open(filename, 'rb') as f:
+        raw = f.read()
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
 
 def extract_model_info(model_name):
     """Extract provider and model from model name"""
@@ -33,66 +49,127 @@ def extract_model_info(model_name):
         return provider.capitalize(), model
     return 'Unknown', model_name
 
-def analyze_challenge_performance(data):
+def flatten_results(data):
+    """Flatten the nested per-model results into one columnar DataFrame.
+
+    Done once after loading so every aggregation reads contiguous arrays
+    instead of re-walking the list-of-dicts JSON structure.
+    """
+    res = pd.json_normalize(
+        data, 'results',
+        meta=['total_challenges', 'successful_challenges', 'average_score', 'total_time_ms']
+    )
+    if 'valid_syntax' not in res.columns:
+        res['valid_syntax'] = True
+    if 'latency_ms' not in res.columns:
+        res['latency_ms'] = np.nan
+
+    # json_normalize meta columns come back as object dtype
+    for column in ('total_challenges', 'successful_challenges', 'average_score', 'total_time_ms'):
+        res[column] = pd.to_numeric(res[column])
+
+    return res
+
+def analyze_challenge_performance(results_df):
     """Analyze performance by challenge type"""
-    challenge_stats = defaultdict(lambda: {'total': 0, 'successful': 0, 'scores': []})
-    
-    for model_data in data:
-        for result in model_data['results']:
-            challenge_id = result['challenge_id']
-            challenge_stats[challenge_id]['total'] += 1
-            if result['score'] > 0.5:  # Consider score > 0.5 as successful
-                challenge_stats[challenge_id]['successful'] += 1
-            challenge_stats[challenge_id]['scores'].append(result['score'])
-    
-    # Calculate average score and success rate for each challenge
-    for challenge_id, stats in challenge_stats.items():
-        stats['avg_score'] = np.mean(stats['scores'])
-        stats['success_rate'] = stats['successful'] / stats['total']
-        stats['std_dev'] = np.std(stats['scores'])
-    
-    return challenge_stats
+    # Aggregate per challenge in a single vectorized groupby pass
+    df = results_df[['challenge_id', 'score']].copy()
+    df['successful'] = df['score'] > 0.5  # Consider score > 0.5 as successful
+
+    grouped = df.groupby('challenge_id')
+    scores = grouped['score']
+    stats = pd.DataFrame({
+        'total': scores.size(),
+        'successful': grouped['successful'].sum(),
+        'avg_score': scores.mean(),
+        'success_rate': grouped['successful'].mean(),
+        'std_dev': scores.std(ddof=0),  # match np.std (population std)
+    })
+
+    return stats.to_dict(orient='index')
 
-def create_performance_dataframe(data):
+def create_performance_dataframe(results_df):
     """Create a comprehensive performance dataframe"""
-    rows = []
-    
-    for model_data in data:
-        provider, model_name = extract_model_info(model_data['model'])
-        
-        # Calculate additional metrics
-        total_score = sum(r['score'] for r in model_data['results'])
-        syntax_errors = sum(1 for r in model_data['results'] if not r.get('valid_syntax', True))
-        perfect_scores = sum(1 for r in model_data['results'] if r['score'] == 1.0)
-        
-        # Calculate average latency
-        latencies = [r.get('latency_ms', 0) for r in model_data['results'] if r.get('latency_ms')]
-        avg_latency = np.mean(latencies) if latencies else 0
-        
-        row = {
-            'Provider': provider,
-            'Model': model_name,
-            'Full Name': model_data['model'],
-            'Total Challenges': model_data['total_challenges'],
-            'Successful': model_data['successful_challenges'],
-            'Success Rate': model_data['successful_challenges'] / model_data['total_challenges'],
-            'Average Score': model_data['average_score'],
-            'Total Score': total_score,
-            'Perfect Scores': perfect_scores,
-            'Syntax Errors': syntax_errors,
-            'Avg Latency (ms)': avg_latency,
-            'Total Time (s)': model_data['total_time_ms'] / 1000
-        }
-        rows.append(row)
-    
-    df = pd.DataFrame(rows)
+    # Per-model metrics come from one vectorized groupby pass over the
+    # flattened results table
+    res = results_df.copy()
+
+    # Ignore missing/zero latencies, like the old list filter did
+    res['latency_ms'] = res['latency_ms'].replace(0, np.nan)
+
+    # Per-model counts via one factorize + bincount over contiguous masks
+    scores = res['score'].to_numpy(dtype=float)
+    valid = res['valid_syntax'].fillna(True).to_numpy(dtype=bool)
+    model_idx, model_order = pd.factorize(res['model'])
+    perfect_counts = np.bincount(
+        model_idx, weights=scores == 1.0, minlength=len(model_order)
+    ).astype(np.int64)
+    syntax_error_counts = np.bincount(
+        model_idx, weights=~valid, minlength=len(model_order)
+    ).astype(np.int64)
+
+    agg = res.groupby('model', sort=False).agg(**{
+        'Total Score': ('score', 'sum'),
+        'Avg Latency (ms)': ('latency_ms', 'mean'),
+    })
+    agg['Avg Latency (ms)'] = agg['Avg Latency (ms)'].fillna(0)
+
+    # Model-level metadata (constant within each model's results)
+    meta = res.groupby('model', sort=False)[
+        ['total_challenges', 'successful_challenges', 'average_score', 'total_time_ms']
+    ].first()
+
+    providers_models = [extract_model_info(model) for model in agg.index]
+    df = pd.DataFrame({
+        'Provider': [pm[0] for pm in providers_models],
+        'Model': [pm[1] for pm in providers_models],
+        'Full Name': agg.index.to_numpy(),
+        'Total Challenges': meta['total_challenges'].to_numpy(),
+        'Successful': meta['successful_challenges'].to_numpy(),
+        'Success Rate': (meta['successful_challenges'] / meta['total_challenges']).to_numpy(),
+        'Average Score': meta['average_score'].to_numpy(),
+        'Total Score': agg['Total Score'].to_numpy(),
+        'Perfect Scores': perfect_counts,
+        'Syntax Errors': syntax_error_counts,
+        'Avg Latency (ms)': agg['Avg Latency (ms)'].to_numpy(),
+        'Total Time (s)': (meta['total_time_ms'] / 1000).to_numpy(),
+    })
+
     df = df.sort_values('Average Score', ascending=False)
     return df
 
-def create_visualization(df, challenge_stats):
-    """Create a comprehensive visualization"""
-    fig = plt.figure(figsize=(20, 12))
-    
+def provider_summary_stats(df):
+    """Aggregate per-provider means with one factorize + bincount pass.
+
+    Cheaper than df.groupby for the handful of providers involved.
+    """
+    codes, providers = pd.factorize(df['Provider'])
+    counts = np.bincount(codes, minlength=len(providers))
+
+    def group_mean(values):
+        return np.bincount(codes, weights=values, minlength=len(providers)) / counts
+
+    summary = pd.DataFrame({
+        'Model': counts,
+        'Average Score': group_mean(df['Average Score'].to_numpy(dtype=float)),
+        'Success Rate': group_mean(df['Success Rate'].to_numpy(dtype=float)),
+        'Avg Latency (ms)': group_mean(df['Avg Latency (ms)'].to_numpy(dtype=float)),
+    }, index=pd.Index(providers, name='Provider'))
+
+    return summary.sort_values('Average Score', ascending=False)
+
+def create_visualization(df, challenge_stats, fig=None):
+    """Create a comprehensive visualization.
+
+    Pass an existing Figure via ``fig`` to reuse it across repeated
+    analyses (e.g. batch runs over many result files); it is cleared
+    and redrawn rather than reallocated.
+    """
+    if fig is None:
+        fig = plt.figure(figsize=(20, 12))
+    else:
+        fig.clear()
+
     # Create a 2x2 grid with equal spacing
     gs = fig.add_gridspec(2, 2, hspace=0.3, wspace=0.3)
     
@@ -101,22 +178,21 @@ def create_visualization(df, challenge_stats):
     # Reverse the order so best models appear on top
     models = df['Model'].values[::-1]
     scores = df['Average Score'].values[::-1]
-    colors = plt.cm.viridis(scores / scores.max())
-    
+    # Single vectorized normalize + colormap call for all bars
+    colors = plt.cm.viridis(plt.Normalize(vmin=0, vmax=scores.max())(scores))
+
     bars = ax1.barh(models, scores, color=colors, edgecolor='black', linewidth=1)
     ax1.set_xlabel('Average Score', fontsize=12, fontweight='bold')
     ax1.set_title('YARA Rule Generation Performance by Model', fontsize=16, fontweight='bold', pad=20)
-    
+
     # Dynamic x-axis range based on actual scores
     min_score = scores.min()
     max_score = scores.max()
     padding = (max_score - min_score) * 0.1
     ax1.set_xlim(max(0, min_score - padding), min(1.0, max_score + padding))
-    
-    # Add value labels
-    for i, (bar, score) in enumerate(zip(bars, scores)):
-        ax1.text(score + 0.002, bar.get_y() + bar.get_height()/2, 
-                f'{score:.3f}', va='center', fontsize=10)
+
+    # Add value labels in one call instead of a per-bar text loop
+    ax1.bar_label(bars, labels=[f'{s:.3f}' for s in scores], padding=3, fontsize=10)
     
     # 2. Success Rate vs Latency Scatter (top right)
     ax2 = fig.add_subplot(gs[0, 1])
@@ -136,11 +212,7 @@ def create_visualization(df, challenge_stats):
     
     # 3. Provider Comparison (bottom left)
     ax3 = fig.add_subplot(gs[1, 0])
-    provider_stats = df.groupby('Provider').agg({
-        'Average Score': 'mean',
-        'Success Rate': 'mean',
-        'Avg Latency (ms)': 'mean'
-    }).sort_values('Average Score', ascending=False)
+    provider_stats = provider_summary_stats(df)
     
     provider_stats['Average Score'].plot(kind='bar', ax=ax3, color='skyblue', 
                                         edgecolor='black', linewidth=1)
@@ -196,12 +268,21 @@ def create_visualization(df, challenge_stats):
                  fontsize=20, fontweight='bold', y=0.98)
     
     # Add timestamp
-    plt.figtext(0.99, 0.01, f'Generated: {datetime.now().strftime("%Y-%m-%d %H:%M")}', 
-                ha='right', fontsize=10, alpha=0.7)
-    
-    plt.tight_layout()
+    fig.text(0.99, 0.01, f'Generated: {datetime.now().strftime("%Y-%m-%d %H:%M")}',
+             ha='right', fontsize=10, alpha=0.7)
+
+    fig.tight_layout()
+    return fig
+
+def build_score_arrays(results_df):
+    """Build a model -> ndarray[score] lookup for O(1) per-model access"""
+    return {
+        model: scores.to_numpy(dtype=np.float32)
+        for model, scores in results_df.groupby('model', sort=False)['score']
+    }
 
-def generate_markdown_report(df, challenge_stats, data):
+
+def generate_markdown_report(df, challenge_stats, scores_by_model):
     """Generate a comprehensive Markdown report"""
     
     # Calculate additional statistics
@@ -209,7 +290,7 @@ def generate_markdown_report(df, challenge_stats, data):
     total_successful = sum(df['Successful'])
     overall_success_rate = total_successful / total_challenges_run
     
-    report = f"""# YaraBench Model Performance Analysis Report
+    parts = [f"""# YaraBench Model Performance Analysis Report
 
 *Generated: {datetime.now().strftime("%Y-%m-%d %H:%M UTC")}*
 
@@ -228,77 +309,74 @@ This report analyzes the performance of **{len(df)} AI models** in generating YA
 
 | Rank | Model | Provider | Avg Score | Success Rate | Perfect Scores | Syntax Errors | Avg Latency |
 |------|-------|----------|-----------|--------------|----------------|---------------|-------------|
-"""
+"""]
     
-    for i, row in df.iterrows():
-        report += f"| {i+1} | **{row['Model']}** | {row['Provider']} | {row['Average Score']:.3f} | {row['Success Rate']:.1%} | {row['Perfect Scores']} | {row['Syntax Errors']} | {row['Avg Latency (ms)']:.0f}ms |\n"
+    # Zipped column arrays avoid iterrows' per-row Series materialization
+    leaderboard = zip(
+        df['Model'], df['Provider'], df['Average Score'], df['Success Rate'],
+        df['Perfect Scores'], df['Syntax Errors'], df['Avg Latency (ms)']
+    )
+    for rank, (model, provider, avg_score, success_rate, perfect, syn_errors, latency) in enumerate(leaderboard, start=1):
+        parts.append(f"| {rank} | **{model}** | {provider} | {avg_score:.3f} | {success_rate:.1%} | {perfect} | {syn_errors} | {latency:.0f}ms |\n")
     
-    report += f"""
+    parts.append(f"""
 ## Performance by Provider
 
 | Provider | Models | Avg Score | Avg Success Rate | Avg Latency |
 |----------|--------|-----------|------------------|-------------|
-"""
+""")
     
-    provider_summary = df.groupby('Provider').agg({
-        'Model': 'count',
-        'Average Score': 'mean',
-        'Success Rate': 'mean',
-        'Avg Latency (ms)': 'mean'
-    }).sort_values('Average Score', ascending=False)
+    provider_summary = provider_summary_stats(df)
     
     for provider, stats in provider_summary.iterrows():
-        report += f"| {provider} | {int(stats['Model'])} | {stats['Average Score']:.3f} | {stats['Success Rate']:.1%} | {stats['Avg Latency (ms)']:.0f}ms |\n"
+        parts.append(f"| {provider} | {int(stats['Model'])} | {stats['Average Score']:.3f} | {stats['Success Rate']:.1%} | {stats['Avg Latency (ms)']:.0f}ms |\n")
     
     # Challenge Analysis
     sorted_challenges = sorted(challenge_stats.items(), key=lambda x: x[1]['success_rate'])
     
-    report += f"""
+    parts.append(f"""
 ## Challenge Analysis
 
 ### Most Difficult Challenges
 | Challenge | Success Rate | Avg Score | Std Dev |
 |-----------|--------------|-----------|---------|
-"""
+""")
     
     for challenge_id, stats in sorted_challenges[:5]:
         challenge_name = challenge_id.replace('l1_', '').replace('_', ' ').title()
-        report += f"| {challenge_name} | {stats['success_rate']:.1%} | {stats['avg_score']:.3f} | {stats['std_dev']:.3f} |\n"
+        parts.append(f"| {challenge_name} | {stats['success_rate']:.1%} | {stats['avg_score']:.3f} | {stats['std_dev']:.3f} |\n")
     
-    report += f"""
+    parts.append(f"""
 ### Easiest Challenges
 | Challenge | Success Rate | Avg Score | Std Dev |
 |-----------|--------------|-----------|---------|
-"""
+""")
     
     for challenge_id, stats in sorted_challenges[-5:]:
         challenge_name = challenge_id.replace('l1_', '').replace('_', ' ').title()
-        report += f"| {challenge_name} | {stats['success_rate']:.1%} | {stats['avg_score']:.3f} | {stats['std_dev']:.3f} |\n"
+        parts.append(f"| {challenge_name} | {stats['success_rate']:.1%} | {stats['avg_score']:.3f} | {stats['std_dev']:.3f} |\n")
     
     # Model-specific insights
-    report += """
+    parts.append("""
 ## Model-Specific Insights
 
 ### Top Performers Analysis
-"""
+""")
     
     for i in range(min(3, len(df))):
         row = df.iloc[i]
-        model_data = next(m for m in data if m['model'] == row['Full Name'])
-        
-        # Analyze strengths
-        challenge_scores = [(r['challenge_id'], r['score']) for r in model_data['results']]
-        perfect_challenges = [c[0] for c in challenge_scores if c[1] == 1.0]
-        
-        report += f"""
+        scores = scores_by_model[row['Full Name']]
+        perfect_count = int((scores == 1.0).sum())
+
+        parts.append(f"""
 #### {i+1}. {row['Full Name']}
 - **Average Score**: {row['Average Score']:.3f}
-- **Strengths**: Perfect scores in {len(perfect_challenges)} challenges
+- **Strengths**: Perfect scores in {perfect_count} challenges
 - **Processing Speed**: {row['Avg Latency (ms)']:.0f}ms average latency
 - **Reliability**: {row['Syntax Errors']} syntax errors out of {row['Total Challenges']} challenges
-"""
+""")
     
-    report += """
+    parts.append("""
 ## Methodology
 
 The evaluation tested each model's ability to generate YARA rules for various security scenarios including:
@@ -330,9 +408,9 @@ Based on this analysis:
 ---
 
 *This report was automatically generated from YaraBench evaluation data.*
-"""
+""")
     
-    return report
+    return ''.join(parts)
 
 def main():
     """Main analysis function"""
@@ -356,12 +434,13 @@ def main():
     
     print(f"Loading data from {input_file}...")
     data = load_data(input_file)
+    results_df = flatten_results(data)
     
     print("Analyzing challenge performance...")
-    challenge_stats = analyze_challenge_performance(data)
+    challenge_stats = analyze_challenge_performance(results_df)
     
     print("Creating performance dataframe...")
-    df = create_performance_dataframe(data)
+    df = create_performance_dataframe(results_df)
     
     print("\nModel Performance Summary:")
     print(df[['Model', 'Provider', 'Average Score', 'Success Rate', 'Avg Latency (ms)']].to_string())
@@ -372,7 +451,8 @@ def main():
     plt.close()
     
     print("Generating Markdown report...")
-    report = generate_markdown_report(df, challenge_stats, data)
+    scores_by_model = build_score_arrays(results_df)
+    report = generate_markdown_report(df, challenge_stats, scores_by_model)
     
     with open(output_report, 'w') as f:
         f.write(report)
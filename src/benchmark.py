@@ -1,7 +1,11 @@
 """Main benchmark orchestrator."""
 
+import hashlib
+import json
 import time
-from typing import List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import List, Dict, Any, Optional
 from datetime import datetime
 
 from rich.console import Console
@@ -10,13 +14,18 @@ from rich.table import Table
 
 from .models import Config, Challenge, RuleResult, BenchmarkResult
 from .levels import Level1, Level2, Level3
-from .llm import LLMClient
+from .llm import LLMClient, SemanticCache, format_challenge_prompt, pack_batch, submit_batch
 from .parsing import YaraExtractor
 from .evaluation import YaraValidator, FileMatcher, LLMJudge
 from .output import TerminalOutput, JSONOutput, CSVOutput
 
 console = Console()
 
+# Score component weights (syntax, strings, keywords, matches[, judge]),
+# hoisted to module level so the scoring hot path doesn't rebuild dicts
+_WEIGHTS_WITH_JUDGE = (0.2, 0.15, 0.1, 0.35, 0.2)
+_WEIGHTS_NO_JUDGE = (0.3, 0.2, 0.1, 0.4)
+
 
 class Benchmark:
     """Main benchmark orchestrator."""
@@ -41,10 +50,32 @@ class Benchmark:
             FileMatcher()
         ]
         if config.judge_model:
-            self.evaluators.append(LLMJudge(LLMClient(config.judge_model)))
+            self.evaluators.append(
+                LLMJudge(
+                    LLMClient(config.judge_model),
+                    use_cache=config.use_cache,
+                    judge_batch_size=config.judge_batch_size,
+                )
+            )
         
         # Initialize output handler
         self.output_handler = self._init_output_handler()
+
+        # Disk cache for LLM responses (used when config.use_cache is set)
+        self.cache_dir = Path(".yarabench_cache")
+
+        # Optional semantic cache layer: near-duplicate prompts reuse
+        # responses at embedding cost instead of full generation cost
+        self.semantic_caches = {}
+        if config.semantic_cache:
+            self.semantic_caches = {
+                name: SemanticCache(
+                    client.client,
+                    threshold=config.cache_threshold,
+                    cache_dir=self.cache_dir,
+                )
+                for name, client in self.llm_clients.items()
+            }
     
     def _init_levels(self) -> Dict[str, Any]:
         """Initialize challenge levels based on config."""
@@ -56,7 +87,7 @@ class Benchmark:
             # Level 2 needs an LLM client for synthetic generation
             # Use the first model's client for generation
             first_model = list(self.llm_clients.values())[0] if self.llm_clients else None
-            levels["level2"] = Level2(llm_client=first_model)
+            levels["level2"] = Level2(llm_client=first_model, use_cache=self.config.use_cache)
         if "level3" in self.config.levels:
             levels["level3"] = Level3()
         
@@ -75,26 +106,27 @@ class Benchmark:
         """Run the benchmark."""
         start_time = time.time()
         all_results = []
-        
+
+        # Load each level's challenges once and share the instances
+        # across models: reloading per model repeated file parsing and
+        # pydantic validation (and regenerated level-2 challenges)
+        level_challenges = {}
+        for level_name, level in self.levels.items():
+            if level_name == "level2":
+                level_challenges[level_name] = level.get_challenges(self.config.synthetic_count)
+            else:
+                level_challenges[level_name] = level.get_challenges()
+
         # Run benchmark for each model
         for model_name, client in self.llm_clients.items():
             console.print(f"\n[bold cyan]Benchmarking {model_name}...[/bold cyan]")
             
             model_results = []
-            total_challenges = 0
-            successful_challenges = 0
-            total_score = 0.0
-            
+
             # Process each level
-            for level_name, level in self.levels.items():
+            for level_name, challenges in level_challenges.items():
                 console.print(f"\n[yellow]Processing {level_name}...[/yellow]")
-                
-                # Get challenges
-                if level_name == "level2":
-                    challenges = level.get_challenges(self.config.synthetic_count)
-                else:
-                    challenges = level.get_challenges()
-                
+
                 # Process challenges with progress bar
                 with Progress(
                     SpinnerColumn(),
@@ -109,17 +141,49 @@ class Benchmark:
                         total=len(challenges)
                     )
                     
-                    for challenge in challenges:
-                        result = self._evaluate_challenge(client, challenge)
-                        model_results.append(result)
-                        
-                        total_challenges += 1
-                        if result.valid_syntax:
-                            successful_challenges += 1
-                        total_score += result.score
-                        
-                        progress.update(task, advance=1)
-            
+                    # Phase 1: rule generation is network-bound. Either pack
+                    # several challenges into each request (batch_size > 1)
+                    # or fan individual requests out across threads
+                    generations = []
+                    batch_size = self.config.batch_size
+                    if self.config.batch_api:
+                        generations = self._generate_rules_batch_api(client, challenges)
+                        progress.update(task, advance=len(challenges))
+                    elif batch_size > 1:
+                        # Batches are packed by token budget, not just
+                        # count, so the largest batch still fits the
+                        # context window with its completion reserve
+                        for batch in pack_batch(
+                            challenges,
+                            client.model_config.name,
+                            client.model_config.context_window,
+                            client.model_config.max_tokens,
+                            max_count=batch_size,
+                        ):
+                            generations.extend(self._generate_rule_batch(client, batch))
+                            progress.update(task, advance=len(batch))
+                    else:
+                        with ThreadPoolExecutor(max_workers=self.config.concurrency) as executor:
+                            futures = {
+                                executor.submit(self._generate_rule, client, challenge): challenge
+                                for challenge in challenges
+                            }
+
+                            for future in as_completed(futures):
+                                generations.append(future.result())
+                                progress.update(task, advance=1)
+
+                # Phase 2: evaluate all generated rules, batched per evaluator
+                model_results.extend(self._evaluate_generations(client, generations))
+
+            # One pass over the results instead of a pass per statistic
+            total_challenges = len(model_results)
+            successful_challenges = 0
+            total_score = 0.0
+            for r in model_results:
+                successful_challenges += r.valid_syntax
+                total_score += r.score
+
             # Create benchmark result
             benchmark_result = BenchmarkResult(
                 model=model_name,
@@ -140,79 +204,251 @@ class Benchmark:
         if self.config.output_format == "terminal":
             self._show_summary(all_results)
     
-    def _evaluate_challenge(self, client: LLMClient, challenge: Challenge) -> RuleResult:
-        """Evaluate a single challenge."""
-        # Generate rule
+    def _cache_key(self, client: LLMClient, challenge: Challenge) -> str:
+        """Build a stable cache key for a (model, challenge) request.
+
+        Sampling parameters are part of the key so cached responses from
+        a run with different temperature or max_tokens are not reused.
+        """
+        model = client.model_config
+        raw = (
+            f"{model.name}|{model.temperature}|{model.max_tokens}"
+            f"|{challenge.id}|{format_challenge_prompt(challenge)}"
+        )
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def _cache_get(self, key: str) -> Optional[str]:
+        """Look up a cached LLM response, returning None on miss."""
+        cache_file = self.cache_dir / f"{key}.json"
+        if not cache_file.exists():
+            return None
+        try:
+            return json.loads(cache_file.read_text())["response"]
+        except Exception:
+            return None
+
+    def _cache_set(self, key: str, response: str) -> None:
+        """Store an LLM response in the disk cache."""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            (self.cache_dir / f"{key}.json").write_text(json.dumps({"response": response}))
+        except Exception:
+            # Caching is best-effort; never fail the benchmark over it
+            pass
+
+    def _generate_rule(self, client: LLMClient, challenge: Challenge):
+        """Generate a rule for a single challenge.
+
+        Returns:
+            Tuple of (challenge, response, rule, latency_ms, error)
+        """
         start_time = time.time()
-        
+
+        cache_key = None
+        if self.config.use_cache:
+            cache_key = self._cache_key(client, challenge)
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                rule = YaraExtractor.extract_single_rule(cached)
+                return (challenge, cached, rule, (time.time() - start_time) * 1000, None)
+
+        # Semantic layer: a near-duplicate prompt from an earlier run can
+        # satisfy the request at embedding cost instead of generation cost
+        semantic_cache = self.semantic_caches.get(client.model_config.name)
+        if semantic_cache is not None:
+            cached = semantic_cache.get(
+                format_challenge_prompt(challenge),
+                client.model_config.name,
+                client.model_config.temperature,
+            )
+            if cached is not None:
+                rule = YaraExtractor.extract_single_rule(cached)
+                return (challenge, cached, rule, (time.time() - start_time) * 1000, None)
+
         try:
             response = client.generate_rule(challenge)
             latency_ms = (time.time() - start_time) * 1000
-            
+
+            if cache_key is not None:
+                self._cache_set(cache_key, response)
+            if semantic_cache is not None:
+                semantic_cache.set(
+                    format_challenge_prompt(challenge),
+                    client.model_config.name,
+                    client.model_config.temperature,
+                    response,
+                )
+
             # Extract YARA rule
             rule = YaraExtractor.extract_single_rule(response)
-            
-            # If not actionable and no rule returned, that's correct
-            if not challenge.actionable and not rule:
-                return RuleResult(
+            return (challenge, response, rule, latency_ms, None)
+
+        except Exception as e:
+            return (challenge, "", None, (time.time() - start_time) * 1000, str(e))
+
+    def _generate_rules_batch_api(self, client: LLMClient, challenges: List[Challenge]):
+        """Generate rules through the asynchronous Batch API.
+
+        All challenges for the level go up as one batch job; wall time is
+        dominated by the provider's queue, so per-challenge latency is
+        reported as the shared average.
+
+        Returns:
+            List of (challenge, response, rule, latency_ms, error) tuples
+            in challenge order
+        """
+        start_time = time.time()
+        try:
+            responses = submit_batch(
+                client.client, challenges, client.model_config,
+                poll_interval=self.config.batch_poll_interval
+            )
+        except Exception as e:
+            error = f"Batch API submission failed: {e}"
+            return [(challenge, "", None, 0.0, error) for challenge in challenges]
+
+        latency_ms = (time.time() - start_time) * 1000 / max(len(challenges), 1)
+
+        generations = []
+        for challenge in challenges:
+            response = responses.get(challenge.id)
+            if response is None:
+                generations.append(
+                    (challenge, "", None, latency_ms, "No response in batch output")
+                )
+            else:
+                rule = YaraExtractor.extract_single_rule(response)
+                generations.append((challenge, response, rule, latency_ms, None))
+
+        return generations
+
+    def _generate_rule_batch(self, client: LLMClient, challenges: List[Challenge]):
+        """Generate rules for a batch of challenges with one API call.
+
+        Cache hits are resolved up front so only misses are sent; slots
+        the model skips or mislabels fall back to individual generation,
+        so an alignment failure costs one extra request, not the batch.
+
+        Returns:
+            List of (challenge, response, rule, latency_ms, error) tuples
+            in challenge order
+        """
+        generations = {}
+        pending = []
+
+        for challenge in challenges:
+            if self.config.use_cache:
+                cache_key = self._cache_key(client, challenge)
+                cached = self._cache_get(cache_key)
+                if cached is not None:
+                    rule = YaraExtractor.extract_single_rule(cached)
+                    generations[challenge.id] = (challenge, cached, rule, 0.0, None)
+                    continue
+            pending.append(challenge)
+
+        if pending:
+            start_time = time.time()
+            try:
+                answers = client.generate_rules_batch(pending)
+            except Exception:
+                # Batched call failed outright; retry everything individually
+                answers = [None] * len(pending)
+            # Wall time is shared by the whole batch
+            latency_ms = (time.time() - start_time) * 1000 / len(pending)
+
+            for challenge, answer in zip(pending, answers):
+                if answer is None:
+                    generations[challenge.id] = self._generate_rule(client, challenge)
+                    continue
+
+                if self.config.use_cache:
+                    self._cache_set(self._cache_key(client, challenge), answer)
+
+                rule = YaraExtractor.extract_single_rule(answer)
+                generations[challenge.id] = (challenge, answer, rule, latency_ms, None)
+
+        return [generations[challenge.id] for challenge in challenges]
+
+    def _evaluate_generations(self, client: LLMClient, generations) -> List[RuleResult]:
+        """Evaluate a batch of generated rules.
+
+        Challenges whose outcome is already decided (generation errors or
+        missing rules) are resolved directly; the rest go through each
+        evaluator's batch path so per-rule setup cost is amortized.
+        """
+        model = client.model_config.name
+        results = []
+        pending = []
+
+        for challenge, response, rule, latency_ms, error in generations:
+            if error is not None:
+                results.append(RuleResult(
                     challenge_id=challenge.id,
-                    model=client.model_config.name,
+                    model=model,
+                    generated_rule=None,
+                    generated_response=response,
+                    valid_syntax=False,
+                    score=0.0,
+                    error=error,
+                    latency_ms=latency_ms
+                ))
+            elif not challenge.actionable and not rule:
+                # If not actionable and no rule returned, that's correct
+                results.append(RuleResult(
+                    challenge_id=challenge.id,
+                    model=model,
                     generated_rule=None,
                     generated_response=response,
                     valid_syntax=True,  # No rule is valid for non-actionable
                     score=1.0,
                     latency_ms=latency_ms
-                )
-            
-            # If actionable but no rule, that's a failure
-            if challenge.actionable and not rule:
-                return RuleResult(
+                ))
+            elif challenge.actionable and not rule:
+                # If actionable but no rule, that's a failure
+                results.append(RuleResult(
                     challenge_id=challenge.id,
-                    model=client.model_config.name,
+                    model=model,
                     generated_rule=None,
                     generated_response=response,
                     valid_syntax=False,
                     score=0.0,
                     error="No valid YARA rule extracted",
                     latency_ms=latency_ms
-                )
-            
-            # Evaluate the rule
-            eval_results = {}
-            for evaluator in self.evaluators:
-                eval_results.update(evaluator.evaluate(challenge, rule))
-            
-            # Calculate score
-            score = self._calculate_score(challenge, rule, eval_results)
-            
-            return RuleResult(
+                ))
+            else:
+                pending.append((challenge, response, rule, latency_ms))
+
+        if not pending:
+            return results
+
+        # Run every evaluator over the whole batch and merge per item
+        items = [(challenge, rule) for challenge, _, rule, _ in pending]
+        eval_results = [{} for _ in pending]
+        for evaluator in self.evaluators:
+            for merged, outcome in zip(eval_results, evaluator.batch_evaluate(items)):
+                merged.update(outcome)
+
+        for (challenge, response, rule, latency_ms), item_results in zip(pending, eval_results):
+            score = self._calculate_score(challenge, rule, item_results)
+
+            results.append(RuleResult(
                 challenge_id=challenge.id,
-                model=client.model_config.name,
+                model=model,
                 generated_rule=rule,
                 generated_response=response,
-                valid_syntax=eval_results.get("valid_syntax", False),
-                execution_results=eval_results.get("execution_results", {}),
-                expected_strings_found=eval_results.get("expected_strings_found", []),
-                expected_keywords_found=eval_results.get("expected_keywords_found", []),
+                valid_syntax=item_results.get("valid_syntax", False),
+                execution_results=item_results.get("execution_results", {}),
+                expected_strings_found=item_results.get("expected_strings_found", []),
+                expected_keywords_found=item_results.get("expected_keywords_found", []),
                 score=score,
-                error=eval_results.get("error"),
+                error=item_results.get("error"),
                 latency_ms=latency_ms,
-                llm_judge_score=eval_results.get("llm_judge_score"),
-                llm_judge_feedback=eval_results.get("llm_judge_feedback"),
-                llm_judge_details=eval_results.get("llm_judge_details")
-            )
-            
-        except Exception as e:
-            return RuleResult(
-                challenge_id=challenge.id,
-                model=client.model_config.name,
-                generated_rule=None,
-                generated_response="",
-                valid_syntax=False,
-                score=0.0,
-                error=str(e),
-                latency_ms=(time.time() - start_time) * 1000
-            )
+                llm_judge_score=item_results.get("llm_judge_score"),
+                llm_judge_feedback=item_results.get("llm_judge_feedback"),
+                llm_judge_details=item_results.get("llm_judge_details")
+            ))
+
+        return results
     
     def _calculate_score(self, challenge: Challenge, rule: str, eval_results: Dict[str, Any]) -> float:
         """Calculate composite score for a rule."""
@@ -220,61 +456,51 @@ class Benchmark:
         syntax_score = 1.0 if eval_results.get("valid_syntax", False) else 0.0
         
         # Feature coverage score
-        expected_strings = len(challenge.expected_strings)
+        expected_strings = challenge.n_expected_strings
         found_strings = len(eval_results.get("expected_strings_found", []))
         string_score = found_strings / expected_strings if expected_strings > 0 else 1.0
-        
-        expected_keywords = len(challenge.expected_keywords)
+
+        expected_keywords = challenge.n_expected_keywords
         found_keywords = len(eval_results.get("expected_keywords_found", []))
         keyword_score = found_keywords / expected_keywords if expected_keywords > 0 else 1.0
-        
+
         # File matching score
         execution_results = eval_results.get("execution_results", {})
         if execution_results:
+            # FileMatcher populates execution_results in test_files order, so
+            # compare positionally against the cached expected flags instead
+            # of doing a dict lookup per file
             correct_matches = sum(
-                1 for test_file in challenge.test_files
-                if execution_results.get(test_file.name, False) == test_file.should_match
+                actual == expected
+                for actual, expected in zip(
+                    execution_results.values(), challenge.should_match_flags
+                )
             )
-            match_score = correct_matches / len(challenge.test_files)
+            match_score = correct_matches / challenge.n_test_files
         else:
             match_score = 0.0
         
         # Check if LLM judge score is available
         llm_judge_score = eval_results.get("llm_judge_score", None)
-        
+
         if llm_judge_score is not None:
-            # Weight the scores with LLM judge
-            weights = {
-                "syntax": 0.2,
-                "strings": 0.15,
-                "keywords": 0.1,
-                "matches": 0.35,
-                "judge": 0.2
-            }
-            
+            w_syntax, w_strings, w_keywords, w_matches, w_judge = _WEIGHTS_WITH_JUDGE
             final_score = (
-                weights["syntax"] * syntax_score +
-                weights["strings"] * string_score +
-                weights["keywords"] * keyword_score +
-                weights["matches"] * match_score +
-                weights["judge"] * llm_judge_score
+                w_syntax * syntax_score +
+                w_strings * string_score +
+                w_keywords * keyword_score +
+                w_matches * match_score +
+                w_judge * llm_judge_score
             )
         else:
-            # Weight the scores without LLM judge
-            weights = {
-                "syntax": 0.3,
-                "strings": 0.2,
-                "keywords": 0.1,
-                "matches": 0.4
-            }
-            
+            w_syntax, w_strings, w_keywords, w_matches = _WEIGHTS_NO_JUDGE
             final_score = (
-                weights["syntax"] * syntax_score +
-                weights["strings"] * string_score +
-                weights["keywords"] * keyword_score +
-                weights["matches"] * match_score
+                w_syntax * syntax_score +
+                w_strings * string_score +
+                w_keywords * keyword_score +
+                w_matches * match_score
             )
-        
+
         return final_score
     
     def _show_summary(self, results: List[BenchmarkResult]):
@@ -7,7 +7,6 @@ from typing import List, Optional
 
 import click
 from rich.console import Console
-from rich.table import Table
 
 # Try to load .env file if available
 try:
@@ -17,8 +16,9 @@ except ImportError:
     pass
 
 from . import __version__
-from .models import Config, ModelConfig
-from .benchmark import Benchmark
+
+# Heavy dependencies (yara, openai, pydantic models) are imported inside
+# the commands that need them so --help and light subcommands start fast
 
 console = Console()
 
@@ -73,6 +73,11 @@ def cli():
     default=10,
     help="Number of synthetic challenges for Level 2"
 )
+@click.option(
+    "--use-cache",
+    is_flag=True,
+    help="Cache LLM responses and judge verdicts on disk for reuse across runs"
+)
 @click.option(
     "--verbose", "-v",
     is_flag=True,
@@ -87,9 +92,13 @@ def run(
     output_file: Optional[str],
     judge: Optional[str],
     synthetic_count: int,
+    use_cache: bool,
     verbose: bool
 ):
     """Run the benchmark on specified models."""
+    from .models import Config, ModelConfig
+    from .benchmark import Benchmark
+
     # Parse levels
     if levels.lower() == "all":
         level_list = ["level1", "level2", "level3"]
@@ -127,6 +136,7 @@ def run(
         synthetic_count=synthetic_count,
         output_format=output,
         output_file=output_file,
+        use_cache=use_cache,
         verbose=verbose
     )
     
@@ -179,6 +189,19 @@ def list(level: Optional[str]):
         console.print()
 
 
+@cli.command(name="clear-cache")
+def clear_cache():
+    """Clear cached LLM responses and judge verdicts."""
+    import shutil
+
+    cache_dir = Path(".yarabench_cache")
+    if cache_dir.exists():
+        shutil.rmtree(cache_dir)
+        console.print(f"[green]Cleared cache at {cache_dir}[/green]")
+    else:
+        console.print("[yellow]No cache to clear[/yellow]")
+
+
 @cli.command()
 @click.option(
     "--level", "-l",
@@ -219,15 +242,26 @@ def validate(level: str):
 
 
 @cli.command()
-def test():
+@click.option(
+    "--last-failed", "--lf",
+    is_flag=True,
+    help="Only re-run tests that failed on the previous run"
+)
+def test(last_failed: bool):
     """Run tests."""
+    # Skip third-party plugin entry-point scanning; the suite only uses
+    # pytest built-ins and this shaves noticeable cold-start time
+    os.environ.setdefault("PYTEST_DISABLE_PLUGIN_AUTOLOAD", "1")
     import pytest
-    
+
     console.print("[bold]Running YaraBench Tests[/bold]\n")
-    
+
     # Run pytest
     test_dir = Path(__file__).parent.parent / "tests"
-    exit_code = pytest.main([str(test_dir), "-v"])
+    args = [str(test_dir), "-v"]
+    if last_failed:
+        args.append("--lf")
+    exit_code = pytest.main(args)
     sys.exit(exit_code)
 
 
@@ -245,10 +279,8 @@ def test():
 )
 def get(levels: str, num_samples: int):
     """Get random challenge(s) for manual testing."""
-    import random
     from .levels import Level1, Level2, Level3
-    from .models import Challenge
-    
+
     console.print(f"[bold]Random Challenges for Manual Testing[/bold]\n")
     
     # Parse levels
@@ -264,12 +296,11 @@ def get(levels: str, num_samples: int):
         try:
             if level_num == "1":
                 level = Level1()
-                challenges = level.get_challenges()
-                
-                if challenges:
-                    # Sample random challenges
-                    sampled = random.sample(challenges, min(num_samples, len(challenges)))
-                    
+                # Level1 samples file paths before loading, so only the
+                # requested challenges are parsed
+                sampled = level.get_challenges(count=num_samples)
+
+                if sampled:
                     for i, challenge in enumerate(sampled, 1):
                         console.print(f"\n[green]Challenge {i}:[/green]")
                         console.print(f"ID: {challenge.id}")
@@ -325,8 +356,26 @@ def download(token: Optional[str], repo_id: str, force: bool):
     are added with '_hf_' prefix to distinguish them.
     """
     from huggingface_hub import snapshot_download, login
+    from huggingface_hub.utils import GatedRepoError, RepositoryNotFoundError
     import shutil
-    
+
+    def _install(src, dst):
+        """Install a downloaded file, preferring hardlinks over copies.
+
+        The snapshot cache lives on the same filesystem as data/, so a
+        hardlink avoids duplicating the file; fall back to symlink and
+        finally a real copy when linking isn't possible.
+        """
+        # Links fail if the target exists (e.g. --force re-install)
+        Path(dst).unlink(missing_ok=True)
+        try:
+            os.link(src, dst)
+        except OSError:
+            try:
+                os.symlink(src, dst)
+            except OSError:
+                shutil.copy2(src, dst)
+
     console.print(f"[bold]YaraBench Dataset Download[/bold]\n")
     console.print(f"Repository: {repo_id}")
     console.print("This will download additional challenges from HuggingFace")
@@ -345,11 +394,10 @@ def download(token: Optional[str], repo_id: str, force: bool):
     data_path = base_path / "data"
     cache_dir = base_path / ".cache" / "huggingface"
     
-    # Count existing HF challenges
-    import builtins
-    existing_hf = builtins.list(data_path.glob("level*/*_hf_*.json"))
+    # Count existing HF challenges without materializing a list
+    existing_hf = sum(1 for _ in data_path.glob("level*/*_hf_*.json"))
     if existing_hf and not force:
-        console.print(f"[yellow]Found {len(existing_hf)} existing HuggingFace challenges[/yellow]")
+        console.print(f"[yellow]Found {existing_hf} existing HuggingFace challenges[/yellow]")
         console.print("Use --force to re-download")
         return
     
@@ -376,55 +424,78 @@ def download(token: Optional[str], repo_id: str, force: bool):
         skipped_files = 0
         
         # Check for both direct level* directories and data/level* structure
-        level_dirs = builtins.list(downloaded_path.glob("level*")) + builtins.list(downloaded_path.glob("data/level*"))
-        
+        from itertools import chain
+        level_dirs = chain(downloaded_path.glob("level*"), downloaded_path.glob("data/level*"))
+
+        # Collect (src, dst) pairs first so installs can run in parallel
+        install_pairs = []
         for level_dir in level_dirs:
             if level_dir.is_dir():
                 # Extract just the level name (e.g., "level1" from "data/level1")
                 level_name = level_dir.name
                 target_dir = data_path / level_name
                 target_dir.mkdir(parents=True, exist_ok=True)
-                
+
                 for json_file in level_dir.glob("*.json"):
                     # Add _hf_ prefix to distinguish from demo files
                     target_file = target_dir / f"{json_file.stem}_hf_.json"
-                    
+
                     # Skip if exists and not forcing
                     if target_file.exists() and not force:
                         skipped_files += 1
                         continue
-                    
-                    shutil.copy2(json_file, target_file)
-                    console.print(f"  [green]✓[/green] {level_name}/{target_file.name}")
-                    copied_files += 1
-        
+
+                    install_pairs.append((json_file, target_file))
+
+        # Install with a thread pool and one progress bar instead of a
+        # sequential loop printing a line per file
+        if install_pairs:
+            from concurrent.futures import ThreadPoolExecutor
+            from rich.progress import Progress
+
+            with Progress(console=console) as progress:
+                task = progress.add_task(
+                    f"Installing {len(install_pairs)} files...",
+                    total=len(install_pairs)
+                )
+                with ThreadPoolExecutor(max_workers=16) as executor:
+                    for _ in executor.map(lambda pair: _install(*pair), install_pairs):
+                        progress.update(task, advance=1)
+
+            copied_files = len(install_pairs)
+
         # Summary
         console.print(f"\n[green]✅ Success![/green]")
         console.print(f"  Downloaded: {copied_files} new challenge files")
         if skipped_files > 0:
             console.print(f"  Skipped: {skipped_files} existing files")
         
-        # Count total challenges
-        total_challenges = len(builtins.list(data_path.glob("level*/*.json")))
-        demo_challenges = total_challenges - len(builtins.list(data_path.glob("level*/*_hf_*.json")))
-        
+        # Count total challenges in one pass without materializing lists
+        total_challenges = hf_challenges = 0
+        for challenge_file in data_path.glob("level*/*.json"):
+            total_challenges += 1
+            hf_challenges += "_hf_" in challenge_file.name
+        demo_challenges = total_challenges - hf_challenges
+
         console.print(f"\nTotal challenges available: {total_challenges}")
         console.print(f"  Demo challenges: {demo_challenges}")
         console.print(f"  HuggingFace challenges: {total_challenges - demo_challenges}")
         
         console.print("\nRun './yara-bench list' to see all available challenges.")
         
+    except GatedRepoError as e:
+        console.print(f"\n[red]Error downloading dataset:[/red] {str(e)}")
+        console.print("\n[yellow]This appears to be a gated repository.[/yellow]")
+        console.print(f"Please visit https://huggingface.co/datasets/{repo_id}")
+        console.print("and accept the terms to gain access.")
+        sys.exit(1)
+    except RepositoryNotFoundError as e:
+        console.print(f"\n[red]Error downloading dataset:[/red] {str(e)}")
+        console.print("\n[yellow]Repository not found.[/yellow]")
+        console.print(f"Please check that {repo_id} exists and you have access.")
+        sys.exit(1)
     except Exception as e:
         console.print(f"\n[red]Error downloading dataset:[/red] {str(e)}")
-        
-        if "gated repo" in str(e).lower() or "401" in str(e):
-            console.print("\n[yellow]This appears to be a gated repository.[/yellow]")
-            console.print(f"Please visit https://huggingface.co/datasets/{repo_id}")
-            console.print("and accept the terms to gain access.")
-        elif "404" in str(e):
-            console.print("\n[yellow]Repository not found.[/yellow]")
-            console.print(f"Please check that {repo_id} exists and you have access.")
-        
         sys.exit(1)
 
 
@@ -1,26 +1,41 @@
 """Abstract base class for evaluators."""
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
 
 from ..models import Challenge
 
 
 class Evaluator(ABC):
     """Abstract base class for YARA rule evaluators."""
-    
+
     @abstractmethod
     def evaluate(self, challenge: Challenge, rule: str) -> Dict[str, Any]:
         """Evaluate a YARA rule against a challenge.
-        
+
         Args:
             challenge: The challenge to evaluate against
             rule: The YARA rule to evaluate
-            
+
         Returns:
             Dictionary containing evaluation results
         """
         pass
+
+    def batch_evaluate(self, items: List[Tuple[Challenge, str]]) -> List[Dict[str, Any]]:
+        """Evaluate a batch of (challenge, rule) pairs.
+
+        Subclasses can override this to amortize per-rule setup work
+        (e.g. YARA compilation) across the batch. The default simply
+        evaluates each pair in turn.
+
+        Args:
+            items: List of (challenge, rule) pairs to evaluate
+
+        Returns:
+            List of evaluation result dictionaries, aligned with items
+        """
+        return [self.evaluate(challenge, rule) for challenge, rule in items]
     
     @property
     @abstractmethod
@@ -1,14 +1,78 @@
 """File matching evaluator using YARA."""
 
-import base64
-import tempfile
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any
-import yara
 
-from ..models import Challenge
-from ..utils import fix_base64_padding
+from ..models import Challenge, TestFile
 from .base import Evaluator
 
+# Shared pool for per-file matching; yara's match releases the GIL, so
+# scanning multiple test files in threads runs on real cores
+_EXECUTOR = ThreadPoolExecutor(max_workers=os.cpu_count())
+
+
+# Compiled rules keyed by source digest: lookups hash 64 hex chars
+# instead of the full rule text, and the cache never pins rule source
+# strings in memory. Syntax errors are cached too, so a broken rule
+# isn't reparsed.
+_compile_cache: dict = {}
+_COMPILE_CACHE_MAX = 1024
+
+
+def _compile(rule_src: str):
+    """Compile a YARA rule, returning the syntax error instead of raising."""
+    # Imported here so loading this module (and the evaluation package)
+    # doesn't pay libyara's startup cost; after the first call this is
+    # just a sys.modules lookup
+    import yara
+
+    try:
+        return yara.compile(source=rule_src)
+    except yara.SyntaxError as e:
+        return e
+
+
+def compile_rule(rule: str) -> "yara.Rules":
+    """Compile a YARA rule through the shared compile cache.
+
+    The same rule is often evaluated against many challenges (and again
+    on re-runs), so compilation results are memoized by source digest.
+
+    Raises:
+        yara.SyntaxError: If the rule does not compile
+    """
+    key = hashlib.sha256(rule.encode()).hexdigest()
+    compiled = _compile_cache.get(key)
+    if compiled is None:
+        if len(_compile_cache) >= _COMPILE_CACHE_MAX:
+            _compile_cache.clear()
+        compiled = _compile_cache[key] = _compile(rule)
+    if isinstance(compiled, Exception):
+        raise compiled
+    return compiled
+
+
+def _match_one(compiled_rule: "yara.Rules", test_file: TestFile):
+    """Decode one test file and match the rule against it.
+
+    Returns:
+        Tuple of (file name, matched, error message or None)
+    """
+    # Content is stored decoded on the model, so no per-rule base64 work
+    try:
+        content = test_file.content
+    except Exception as e:
+        return (test_file.name, False, f"Failed to decode {test_file.name}: {str(e)}")
+
+    # Match against content
+    try:
+        matches = compiled_rule.match(data=content)
+        return (test_file.name, len(matches) > 0, None)
+    except Exception as e:
+        return (test_file.name, False, f"Failed to match {test_file.name}: {str(e)}")
+
 
 class FileMatcher(Evaluator):
     """Evaluates YARA rules against test files."""
@@ -37,32 +101,35 @@ class FileMatcher(Evaluator):
         if not challenge.test_files:
             return results
         
+        # Compile the rule (cached across challenges and runs). A broken
+        # rule short-circuits here — cached as a sentinel, so repeated
+        # evaluations of the same bad rule never touch the test files
+        import yara
+
         try:
-            # Compile the rule
-            compiled_rule = yara.compile(source=rule)
-            
-            # Test against each file
-            for test_file in challenge.test_files:
-                # Decode file content with improved base64 handling
-                try:
-                    fixed_b64 = fix_base64_padding(test_file.content_b64)
-                    content = base64.b64decode(fixed_b64)
-                except Exception as e:
-                    results["execution_results"][test_file.name] = False
-                    results["error"] = f"Failed to decode {test_file.name}: {str(e)}"
-                    continue
-                
-                # Match against content
-                try:
-                    matches = compiled_rule.match(data=content)
-                    results["execution_results"][test_file.name] = len(matches) > 0
-                except Exception as e:
-                    results["execution_results"][test_file.name] = False
-                    results["error"] = f"Failed to match {test_file.name}: {str(e)}"
-            
+            compiled_rule = compile_rule(rule)
         except yara.SyntaxError as e:
             results["error"] = f"YARA syntax error: {str(e)}"
+            return results
+
+        try:
+            # Test against each file, in parallel when there are several.
+            # executor.map keeps results in test_files order, which the
+            # scoring path relies on.
+            test_files = challenge.test_files
+            if len(test_files) > 1:
+                outcomes = _EXECUTOR.map(
+                    lambda tf: _match_one(compiled_rule, tf), test_files
+                )
+            else:
+                outcomes = (_match_one(compiled_rule, tf) for tf in test_files)
+
+            for name, matched, error in outcomes:
+                results["execution_results"][name] = matched
+                if error is not None:
+                    results["error"] = error
+
         except Exception as e:
             results["error"] = f"Execution error: {str(e)}"
-        
+
         return results
\ No newline at end of file
@@ -1,24 +1,157 @@
 """LLM-based rule evaluator."""
 
+import hashlib
 import json
-from typing import Dict, Any, Optional
+import re
+import string
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
 
 from ..models import Challenge
 from .base import Evaluator
 
+# orjson parses judge responses several times faster than stdlib json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Extracts the JSON object from a fenced code block in one pass
+_JSON_FENCE = re.compile(r"```(?:json)?\s*(\{.*?\})\s*```", re.DOTALL)
+
+# Static parts of the evaluation prompt, hoisted so each call only
+# substitutes the per-challenge fields instead of rebuilding ~1 KB of text
+_PROMPT_TEMPLATE = string.Template("""You are an expert YARA rule evaluator. Evaluate the following YARA rule against the given challenge.
+
+CHALLENGE:
+$desc
+
+Expected Requirements:
+- Strings to detect: $strings
+- Keywords to use: $keywords
+- Actionable: $actionable
+
+SUBMITTED YARA RULE:
+$rule
+
+Evaluate the rule on these criteria and respond with JSON only:
+{
+  "correctness": {
+    "score": 0-10,
+    "feedback": "Does the rule correctly implement the challenge requirements?"
+  },
+  "completeness": {
+    "score": 0-10,
+    "feedback": "Are all required strings and features included?"
+  },
+  "efficiency": {
+    "score": 0-10,
+    "feedback": "Is the rule optimized and efficient?"
+  },
+  "best_practices": {
+    "score": 0-10,
+    "feedback": "Does it follow YARA best practices and conventions?"
+  },
+  "false_positive_risk": {
+    "score": 0-10,
+    "feedback": "How well does it avoid false positives? (10=very low risk)"
+  },
+  "overall_assessment": "Brief overall assessment of the rule quality"
+}
+
+Be strict but fair. Consider:
+- Syntax correctness
+- Logic accuracy
+- String matching appropriateness
+- Condition complexity
+- Preference for string-based detection over module usage
+- Potential for false positives/negatives""")
+
+# Criterion weights for the overall score, hoisted so scoring doesn't
+# rebuild the dict per call
+_CRITERIA_WEIGHTS = (
+    ("correctness", 0.35),       # Most important
+    ("completeness", 0.25),      # Very important
+    ("efficiency", 0.15),        # Important
+    ("best_practices", 0.15),    # Important
+    ("false_positive_risk", 0.10)  # Important but harder to judge
+)
+
+# Extracts the JSON array from a fenced code block in a batched verdict
+_JSON_ARRAY_FENCE = re.compile(r"```(?:json)?\s*(\[.*?\])\s*```", re.DOTALL)
+
+# Static rubric for batched judging; the per-case blocks follow so the
+# shared prefix stays cacheable
+_BATCH_PROMPT_HEADER = """You are an expert YARA rule evaluator. Evaluate each of the following submitted YARA rules against its challenge.
+
+For every case, score these criteria from 0-10: correctness, completeness, efficiency, best_practices, false_positive_risk.
+
+Respond with a JSON array only, one object per case, in this shape:
+[{"idx": 1, "correctness": {"score": 0, "feedback": "..."}, "completeness": {"score": 0, "feedback": "..."}, "efficiency": {"score": 0, "feedback": "..."}, "best_practices": {"score": 0, "feedback": "..."}, "false_positive_risk": {"score": 0, "feedback": "..."}, "overall_assessment": "..."}]
+
+Be strict but fair. Prefer string-based detection over module usage."""
+
+_BATCH_CASE_TEMPLATE = string.Template("""Case[$idx]:
+Description: $desc
+Expected strings: $strings
+Expected keywords: $keywords
+Actionable: $actionable
+Submitted rule:
+$rule""")
+
+
+def format_judge_batch_prompt(items: List[Tuple[Challenge, str]]) -> str:
+    """Format several (challenge, rule) pairs into one judge prompt.
+
+    The rubric is identical for every case, so batching k cases into a
+    single call pays for it once and cuts judge round trips by k.
+    """
+    cases = [
+        _BATCH_CASE_TEMPLATE.substitute(
+            idx=i,
+            desc=challenge.description,
+            strings=', '.join(challenge.expected_strings) if challenge.expected_strings else 'None specified',
+            keywords=', '.join(challenge.expected_keywords) if challenge.expected_keywords else 'None specified',
+            actionable='Yes' if challenge.actionable else 'No',
+            rule=rule,
+        )
+        for i, (challenge, rule) in enumerate(items, start=1)
+    ]
+    return _BATCH_PROMPT_HEADER + "\n\n" + "\n\n".join(cases)
+
+
+_JUDGE_SYSTEM_PROMPT = """You are a YARA rule expert evaluator. Your role is to:
+1. Analyze YARA rules for correctness, efficiency, and best practices
+2. Provide constructive feedback
+3. Score rules fairly on multiple criteria
+4. Return structured JSON responses
+5. Prefer string-based detection over module usage when possible
+
+Be thorough but concise in your evaluations. Encourage simple, effective rules that use string matching rather than complex module-based analysis."""
+
 
 class LLMJudge(Evaluator):
     """LLM-based evaluator for comprehensive rule quality assessment."""
-    
-    def __init__(self, llm_client, judge_model: Optional[str] = None):
+
+    def __init__(self, llm_client, judge_model: Optional[str] = None,
+                 max_concurrency: int = 8, use_cache: bool = False,
+                 judge_batch_size: int = 1):
         """Initialize with an LLM client.
-        
+
         Args:
             llm_client: LLM client instance for judge queries
             judge_model: Optional specific model to use for judging (defaults to client's model)
+            max_concurrency: Maximum judge requests in flight at once
+            use_cache: Persist judge verdicts to disk and reuse them across runs
+            judge_batch_size: Cases to combine per judge call (1 disables batching)
         """
         self.llm_client = llm_client
         self.judge_model = judge_model
+        self.max_concurrency = max_concurrency
+        self.use_cache = use_cache
+        self.judge_batch_size = judge_batch_size
+        self.cache_dir = Path(".yarabench_cache")
     
     @property
     def name(self) -> str:
@@ -49,35 +182,173 @@ class LLMJudge(Evaluator):
                 "llm_judge_details": {}
             }
         
+        # Re-judging an identical (challenge, rule) pair always sends the
+        # same prompt, so a disk-cache hit skips the API call entirely
+        cache_key = None
+        if self.use_cache:
+            cache_key = self._cache_key(challenge, rule)
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                return cached
+
         # Create evaluation prompt
         evaluation_prompt = self._create_evaluation_prompt(challenge, rule)
-        
+
         try:
             # Get LLM evaluation
             response = self._get_llm_evaluation(evaluation_prompt)
-            
+
             # Parse the response
             evaluation_data = self._parse_evaluation_response(response)
-            
+
             # Calculate overall score
             overall_score = self._calculate_overall_score(evaluation_data)
-            
+
             # Format feedback
             feedback = self._format_feedback(evaluation_data)
-            
-            return {
+
+            result = {
                 "llm_judge_score": overall_score,
                 "llm_judge_feedback": feedback,
                 "llm_judge_details": evaluation_data
             }
-            
+
+            if cache_key is not None:
+                self._cache_set(cache_key, result)
+
+            return result
+
         except Exception as e:
             return {
                 "llm_judge_score": 0.0,
                 "llm_judge_feedback": f"LLM judge error: {str(e)}",
                 "llm_judge_details": {"error": str(e)}
             }
-    
+
+    def batch_evaluate(self, items: List[Tuple[Challenge, str]]) -> List[Dict[str, Any]]:
+        """Evaluate a batch of (challenge, rule) pairs concurrently.
+
+        Judge calls are network-bound, so fan them out across a thread
+        pool (capped at max_concurrency to stay under provider rate
+        limits) instead of paying one serial round-trip per rule.
+
+        Args:
+            items: List of (challenge, rule) pairs to evaluate
+
+        Returns:
+            List of evaluation result dictionaries, aligned with items
+        """
+        if len(items) <= 1:
+            return [self.evaluate(challenge, rule) for challenge, rule in items]
+
+        if self.judge_batch_size > 1:
+            return self._batch_evaluate_grouped(items)
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            return list(executor.map(lambda item: self.evaluate(*item), items))
+
+    def _batch_evaluate_grouped(self, items: List[Tuple[Challenge, str]]) -> List[Dict[str, Any]]:
+        """Judge items in groups of judge_batch_size per API call.
+
+        Cache hits are peeled off first; cases the judge skips in a
+        grouped response fall back to individual evaluation so one
+        malformed verdict only costs one retry.
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+        pending = []
+        for i, (challenge, rule) in enumerate(items):
+            if self.use_cache:
+                cached = self._cache_get(self._cache_key(challenge, rule))
+                if cached is not None:
+                    results[i] = cached
+                    continue
+            pending.append(i)
+
+        for start in range(0, len(pending), self.judge_batch_size):
+            group = pending[start:start + self.judge_batch_size]
+            verdicts = self._judge_group([items[i] for i in group])
+            for i, verdict in zip(group, verdicts):
+                if verdict is None:
+                    # evaluate() handles its own caching and errors
+                    results[i] = self.evaluate(*items[i])
+                else:
+                    if self.use_cache:
+                        self._cache_set(self._cache_key(*items[i]), verdict)
+                    results[i] = verdict
+
+        return results
+
+    def _judge_group(self, group_items: List[Tuple[Challenge, str]]) -> List[Optional[Dict[str, Any]]]:
+        """Run one judge call over a group of cases.
+
+        Returns:
+            Per-case verdict dicts aligned with group_items; None where
+            the group call failed or the judge skipped a case
+        """
+        prompt = format_judge_batch_prompt(group_items)
+        try:
+            response = self._get_llm_evaluation(prompt)
+            match = _JSON_ARRAY_FENCE.search(response)
+            payload = match.group(1) if match else response.strip()
+            if orjson is not None:
+                entries = orjson.loads(payload)
+            else:
+                entries = json.loads(payload)
+        except Exception:
+            return [None] * len(group_items)
+
+        verdicts: List[Optional[Dict[str, Any]]] = [None] * len(group_items)
+        if not isinstance(entries, list):
+            return verdicts
+
+        for entry in entries:
+            if not isinstance(entry, dict):
+                continue
+            idx = entry.get("idx")
+            if not isinstance(idx, int) or not 1 <= idx <= len(group_items):
+                continue
+            evaluation_data = {k: v for k, v in entry.items() if k != "idx"}
+            verdicts[idx - 1] = {
+                "llm_judge_score": self._calculate_overall_score(evaluation_data),
+                "llm_judge_feedback": self._format_feedback(evaluation_data),
+                "llm_judge_details": evaluation_data,
+            }
+
+        return verdicts
+
+    def _cache_key(self, challenge: Challenge, rule: str) -> str:
+        """Build a stable cache key for a (judge model, challenge, rule) triple."""
+        judge_name = self.judge_model or getattr(
+            getattr(self.llm_client, "model_config", None), "name", ""
+        )
+        raw = f"{judge_name}|{challenge.id}|{rule}"
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def _cache_get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look up a cached judge verdict, returning None on miss."""
+        cache_file = self.cache_dir / f"judge_{key}.json"
+        if not cache_file.exists():
+            return None
+        try:
+            if orjson is not None:
+                return orjson.loads(cache_file.read_bytes())
+            return json.loads(cache_file.read_text())
+        except Exception:
+            return None
+
+    def _cache_set(self, key: str, result: Dict[str, Any]) -> None:
+        """Store a judge verdict in the disk cache."""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            cache_file = self.cache_dir / f"judge_{key}.json"
+            if orjson is not None:
+                cache_file.write_bytes(orjson.dumps(result))
+            else:
+                cache_file.write_text(json.dumps(result))
+        except Exception:
+            # Caching is best-effort; never fail evaluation over it
+            pass
+
     def _create_evaluation_prompt(self, challenge: Challenge, rule: str) -> str:
         """Create a comprehensive evaluation prompt for the LLM judge.
         
@@ -88,53 +359,13 @@ class LLMJudge(Evaluator):
         Returns:
             Formatted prompt for LLM evaluation
         """
-        prompt = f"""You are an expert YARA rule evaluator. Evaluate the following YARA rule against the given challenge.
-
-CHALLENGE:
-{challenge.description}
-
-Expected Requirements:
-- Strings to detect: {', '.join(challenge.expected_strings) if challenge.expected_strings else 'None specified'}
-- Keywords to use: {', '.join(challenge.expected_keywords) if challenge.expected_keywords else 'None specified'}
-- Actionable: {'Yes' if challenge.actionable else 'No'}
-
-SUBMITTED YARA RULE:
-{rule}
-
-Evaluate the rule on these criteria and respond with JSON only:
-{{
-  "correctness": {{
-    "score": 0-10,
-    "feedback": "Does the rule correctly implement the challenge requirements?"
-  }},
-  "completeness": {{
-    "score": 0-10,
-    "feedback": "Are all required strings and features included?"
-  }},
-  "efficiency": {{
-    "score": 0-10,
-    "feedback": "Is the rule optimized and efficient?"
-  }},
-  "best_practices": {{
-    "score": 0-10,
-    "feedback": "Does it follow YARA best practices and conventions?"
-  }},
-  "false_positive_risk": {{
-    "score": 0-10,
-    "feedback": "How well does it avoid false positives? (10=very low risk)"
-  }},
-  "overall_assessment": "Brief overall assessment of the rule quality"
-}}
-
-Be strict but fair. Consider:
-- Syntax correctness
-- Logic accuracy
-- String matching appropriateness
-- Condition complexity
-- Preference for string-based detection over module usage
-- Potential for false positives/negatives"""
-        
-        return prompt
+        return _PROMPT_TEMPLATE.substitute(
+            desc=challenge.description,
+            strings=', '.join(challenge.expected_strings) if challenge.expected_strings else 'None specified',
+            keywords=', '.join(challenge.expected_keywords) if challenge.expected_keywords else 'None specified',
+            actionable='Yes' if challenge.actionable else 'No',
+            rule=rule
+        )
     
     def _get_llm_evaluation(self, prompt: str) -> str:
         """Get evaluation from the LLM.
@@ -146,15 +377,8 @@ Be strict but fair. Consider:
             LLM response
         """
         # Use the judge-specific prompt system
-        judge_system_prompt = """You are a YARA rule expert evaluator. Your role is to:
-1. Analyze YARA rules for correctness, efficiency, and best practices
-2. Provide constructive feedback
-3. Score rules fairly on multiple criteria
-4. Return structured JSON responses
-5. Prefer string-based detection over module usage when possible
+        judge_system_prompt = _JUDGE_SYSTEM_PROMPT
 
-Be thorough but concise in your evaluations. Encourage simple, effective rules that use string matching rather than complex module-based analysis."""
-        
         # If we have a custom judge model, we'd use it here
         # For now, use the standard generate method
         try:
@@ -189,17 +413,17 @@ Be thorough but concise in your evaluations. Encourage simple, effective rules t
             Parsed evaluation data
         """
         try:
-            # Try to extract JSON from the response
-            # Handle potential markdown code blocks
-            clean_response = response.strip()
-            if "```json" in clean_response:
-                clean_response = clean_response.split("```json")[1].split("```")[0]
-            elif "```" in clean_response:
-                clean_response = clean_response.split("```")[1].split("```")[0]
-            
+            # Extract JSON from a potential markdown code block in a
+            # single regex pass instead of chained splits
+            match = _JSON_FENCE.search(response)
+            payload = match.group(1) if match else response.strip()
+
             # Parse JSON
-            evaluation_data = json.loads(clean_response.strip())
-            
+            if orjson is not None:
+                evaluation_data = orjson.loads(payload)
+            else:
+                evaluation_data = json.loads(payload)
+
             # Validate expected structure
             required_keys = ["correctness", "completeness", "efficiency", 
                            "best_practices", "false_positive_risk"]
@@ -214,7 +438,7 @@ Be thorough but concise in your evaluations. Encourage simple, effective rules t
             
             return evaluation_data
             
-        except json.JSONDecodeError:
+        except ValueError:
             # Fallback: try to extract some meaning from the response
             return {
                 "correctness": {"score": 5, "feedback": "Unable to parse evaluation"},
@@ -234,24 +458,16 @@ Be thorough but concise in your evaluations. Encourage simple, effective rules t
         Returns:
             Overall score between 0.0 and 1.0
         """
-        # Define weights for each criterion
-        weights = {
-            "correctness": 0.35,      # Most important
-            "completeness": 0.25,     # Very important
-            "efficiency": 0.15,       # Important
-            "best_practices": 0.15,   # Important
-            "false_positive_risk": 0.10  # Important but harder to judge
-        }
-        
         total_score = 0.0
         total_weight = 0.0
-        
-        for criterion, weight in weights.items():
-            if criterion in evaluation_data and isinstance(evaluation_data[criterion], dict):
-                score = evaluation_data[criterion].get("score", 5) / 10.0  # Normalize to 0-1
+
+        for criterion, weight in _CRITERIA_WEIGHTS:
+            criterion_data = evaluation_data.get(criterion)
+            if isinstance(criterion_data, dict):
+                score = criterion_data.get("score", 5) / 10.0  # Normalize to 0-1
                 total_score += score * weight
                 total_weight += weight
-        
+
         # Normalize in case some weights were missing
         if total_weight > 0:
             return total_score / total_weight
@@ -1,10 +1,41 @@
 """YARA rule syntax validator."""
 
-from typing import Dict, Any, List, Optional
-import yara
+import re
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
 
 from ..models import Challenge
 from .base import Evaluator
+from .file_matcher import compile_rule
+
+# Pulls both brace kinds out of the rule in one C-level scan
+_BRACE_RE = re.compile(r"[{}]")
+
+# Matches a structurally plausible rule (name, body, condition section)
+# so well-formed input passes the pre-check with a single scan
+_STRUCTURE_RE = re.compile(r"rule\s+\S+.*?\{.*?condition\s*:.*?\}", re.DOTALL)
+
+
+@lru_cache(maxsize=256)
+def _string_variants(expected: Tuple[str, ...]) -> Tuple[Tuple[str, Tuple[bytes, ...]], ...]:
+    """Precompute the byte encodings each expected string may appear as.
+
+    The same challenge's expected strings are checked against every
+    generated rule, so the literal/repr/hex/escaped variants are built
+    once per challenge rather than once per rule.
+    """
+    return tuple(
+        (
+            expected_string,
+            (
+                expected_string.encode(),
+                repr(expected_string).encode(),
+                expected_string.encode().hex().encode(),
+                expected_string.replace('\\', '\\\\').encode(),
+            ),
+        )
+        for expected_string in expected
+    )
 
 
 class YaraValidator(Evaluator):
@@ -38,9 +69,13 @@ class YaraValidator(Evaluator):
             results["error"] = structure_error
             return results
         
-        # Validate syntax by compiling
+        # Validate syntax by compiling (shared cache with FileMatcher, so
+        # a rule is compiled at most once across evaluators and re-runs).
+        # yara is imported lazily so the package stays cheap to import
+        import yara
+
         try:
-            yara.compile(source=rule)
+            compile_rule(rule)
             results["valid_syntax"] = True
         except yara.SyntaxError as e:
             results["error"] = f"YARA syntax error: {str(e)}"
@@ -49,37 +84,41 @@ class YaraValidator(Evaluator):
             results["error"] = f"YARA compilation error: {str(e)}"
             return results
         
-        # Check for expected strings
-        if challenge.expected_strings:
+        # Check for expected strings; a rule shorter than the shortest
+        # expected string cannot contain any of them
+        if challenge.expected_strings and len(rule) >= min(map(len, challenge.expected_strings)):
             results["expected_strings_found"] = self._find_expected_strings(
                 rule, challenge.expected_strings
             )
-        
-        # Check for expected keywords
-        if challenge.expected_keywords:
+
+        # Check for expected keywords, with the same length gate
+        if challenge.expected_keywords and len(rule) >= min(map(len, challenge.expected_keywords)):
             results["expected_keywords_found"] = self._find_expected_keywords(
-                rule, challenge.expected_keywords
+                rule.lower(), challenge.expected_keywords
             )
-        
+
         return results
     
     def _find_expected_strings(self, rule: str, expected: List[str]) -> List[str]:
         """Find which expected strings appear in the rule."""
-        found = []
-        for expected_string in expected:
-            # Check various ways the string might appear
-            if (expected_string in rule or 
-                repr(expected_string) in rule or
-                expected_string.encode().hex() in rule or
-                expected_string.replace('\\', '\\\\') in rule):
-                found.append(expected_string)
-        return found
+        # Search over bytes so the repr/hex/escape variants are built once
+        # per challenge (cached) and each check is a plain memchr scan
+        rule_b = rule.encode('utf-8', 'replace')
+        return [
+            expected_string
+            for expected_string, variants in _string_variants(tuple(expected))
+            if any(variant in rule_b for variant in variants)
+        ]
     
-    def _find_expected_keywords(self, rule: str, expected: List[str]) -> List[str]:
-        """Find which expected keywords appear in the rule."""
+    def _find_expected_keywords(self, rule_lower: str, expected: List[str]) -> List[str]:
+        """Find which expected keywords appear in the (lowercased) rule.
+
+        Args:
+            rule_lower: The rule text, already lowercased by the caller
+            expected: Expected keywords to look for
+        """
         found = []
-        rule_lower = rule.lower()
-        
+
         for keyword in expected:
             keyword_lower = keyword.lower()
             # Check if keyword appears (with word boundaries for some keywords)
@@ -103,8 +142,17 @@ class YaraValidator(Evaluator):
         """
         if not rule or not rule.strip():
             return "Empty rule"
-        
-        # Check for basic components
+
+        # Fast path: one regex scan confirms all required components are
+        # present, leaving only brace balance to verify
+        if _STRUCTURE_RE.search(rule):
+            braces = _BRACE_RE.findall(rule)
+            if braces.count("{") * 2 != len(braces):
+                return "Incomplete rule structure - unbalanced braces"
+            return None
+
+        # The rule is malformed; classify which component is missing so
+        # the error message stays specific (cold path only)
         if "rule " not in rule:
             return "Incomplete rule structure - missing 'rule' keyword"
         if "{" not in rule:
@@ -113,9 +161,11 @@ class YaraValidator(Evaluator):
             return "Incomplete rule structure - missing closing brace"
         if "condition:" not in rule:
             return "Incomplete rule structure - missing condition"
-        
-        # Check brace balance
-        if rule.count("{") != rule.count("}"):
+
+        braces = _BRACE_RE.findall(rule)
+        if braces.count("{") * 2 != len(braces):
             return "Incomplete rule structure - unbalanced braces"
-        
+
+        # All components present in an unusual arrangement; let the
+        # compiler produce the authoritative error
         return None
\ No newline at end of file
@@ -1,14 +1,34 @@
 """Level 1: Static JSON challenges."""
 
 import json
+from concurrent.futures import ThreadPoolExecutor
+
+# orjson decodes challenge payloads several times faster than stdlib json
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Tuple
 import random
 
 from ..models import Challenge
 from .base import ChallengeLevel as BaseChallengeLevel
 
 
+@lru_cache(maxsize=8)
+def _scan_level(challenge_dir: Path, dir_mtime_ns: int) -> Tuple[Path, ...]:
+    """List challenge files in a directory, cached per directory mtime.
+
+    Commands like list iterate several levels and re-stat the same
+    directories; keying on mtime makes the cache self-invalidating when
+    files are added or removed.
+    """
+    return tuple(sorted(challenge_dir.glob("*.json")))
+
+
 class Level1(BaseChallengeLevel):
     """Static challenge loader for Level 1."""
     
@@ -22,36 +42,61 @@ class Level1(BaseChallengeLevel):
         """Get a description of this challenge level."""
         return "Pre-defined JSON challenges testing specific YARA rule capabilities"
     
+    def _challenge_files(self) -> List[Path]:
+        """List the challenge JSON files for this level."""
+        challenge_dir = self.data_dir / "level1"
+
+        if not challenge_dir.exists():
+            return []
+
+        return list(_scan_level(challenge_dir, challenge_dir.stat().st_mtime_ns))
+
+    def _load_challenge(self, json_file: Path) -> Optional[Challenge]:
+        """Load a single challenge file, returning None on error."""
+        try:
+            # Binary read skips the text-mode decode pass
+            return Challenge(**_loads(json_file.read_bytes()))
+        except Exception as e:
+            print(f"Error loading challenge {json_file}: {e}")
+            return None
+
     def get_challenges(self, count: Optional[int] = None) -> List[Challenge]:
         """Get challenges for this level.
-        
+
+        When count is given, file paths are sampled before loading so
+        only the selected challenges are parsed — asking for one
+        challenge out of thousands no longer loads all of them.
+
         Args:
             count: Maximum number of challenges to return (None for all)
-            
+
         Returns:
             List of challenges
         """
-        challenges = []
-        challenge_dir = self.data_dir / "level1"
-        
-        if not challenge_dir.exists():
-            return []
-        
-        # Load all JSON files
-        for json_file in sorted(challenge_dir.glob("*.json")):
-            try:
-                with open(json_file, "r") as f:
-                    data = json.load(f)
-                    challenge = Challenge(**data)
+        json_files = self._challenge_files()
+
+        # Sample paths first so unrequested challenges are never loaded,
+        # walking a shuffled order lazily so a parse failure pulls in the
+        # next candidate instead of shrinking the sample
+        if count and count < len(json_files):
+            challenges = []
+            for json_file in random.sample(json_files, len(json_files)):
+                challenge = self._load_challenge(json_file)
+                if challenge is not None:
                     challenges.append(challenge)
-            except Exception as e:
-                print(f"Error loading challenge {json_file}: {e}")
-                continue
-        
-        # Return requested number of challenges
-        if count and count < len(challenges):
-            return random.sample(challenges, count)
-        return challenges
+                    if len(challenges) == count:
+                        break
+            return challenges
+
+        # Read and parse files in parallel; loading is I/O-bound and the
+        # JSON decoder releases the GIL during file reads
+        if len(json_files) > 1:
+            with ThreadPoolExecutor(max_workers=min(32, len(json_files))) as executor:
+                loaded = list(executor.map(self._load_challenge, json_files))
+        else:
+            loaded = [self._load_challenge(f) for f in json_files]
+
+        return [challenge for challenge in loaded if challenge is not None]
     
     def validate(self) -> bool:
         """Validate that this level is properly configured.
@@ -66,20 +111,21 @@ class Level1(BaseChallengeLevel):
             return False
         
         # Check that we have at least one valid challenge
-        json_files = list(challenge_dir.glob("*.json"))
+        json_files = self._challenge_files()
         if not json_files:
             print(f"No JSON files found in {challenge_dir}")
             return False
         
-        # Try to load each challenge
-        valid_count = 0
-        for json_file in json_files:
+        # Try to load each challenge, in parallel like get_challenges
+        def check(json_file: Path) -> bool:
             try:
-                with open(json_file, "r") as f:
-                    data = json.load(f)
-                    Challenge(**data)  # Validate with Pydantic
-                    valid_count += 1
+                Challenge(**_loads(json_file.read_bytes()))  # Validate with Pydantic
+                return True
             except Exception as e:
                 print(f"Invalid challenge {json_file}: {e}")
-        
+                return False
+
+        with ThreadPoolExecutor(max_workers=min(32, len(json_files))) as executor:
+            valid_count = sum(executor.map(check, json_files))
+
         return valid_count > 0
\ No newline at end of file
@@ -1,5 +1,7 @@
 """Level 2: Synthetic challenges."""
 
+import json
+from pathlib import Path
 from typing import List, Optional
 
 from ..models import Challenge, ChallengeLevel as ChallengeLevelEnum, ModelConfig
@@ -11,16 +13,19 @@ from .base import ChallengeLevel as BaseChallengeLevel
 
 class Level2(BaseChallengeLevel):
     """Synthetic challenge generator for Level 2."""
-    
-    def __init__(self, data_dir=None, llm_client=None):
+
+    def __init__(self, data_dir=None, llm_client=None, use_cache=False):
         """Initialize Level 2 with synthetic generator.
-        
+
         Args:
             data_dir: Data directory (not used for Level 2)
             llm_client: LLM client for challenge generation
+            use_cache: Persist generated challenges to disk and reuse them
         """
         super().__init__(data_dir)
         self.llm_client = llm_client
+        self.use_cache = use_cache
+        self.cache_dir = Path(".yarabench_cache")
         self.synthetic_generator = None
         if llm_client:
             self.synthetic_generator = SyntheticChallengeGenerator(llm_client)
@@ -47,9 +52,41 @@ class Level2(BaseChallengeLevel):
         if not self.synthetic_generator:
             print("No LLM client provided for Level 2 synthetic generation")
             return []
-        
+
         challenge_count = count or 10
-        return self.synthetic_generator.generate_challenges(challenge_count)
+
+        cache_file = None
+        if self.use_cache:
+            model_name = self.llm_client.model_config.name.replace("/", "_")
+            cache_file = self.cache_dir / f"level2_{model_name}_{challenge_count}.json"
+            cached = self._load_cached_challenges(cache_file)
+            if cached is not None:
+                return cached
+
+        challenges = self.synthetic_generator.generate_challenges(challenge_count)
+
+        if cache_file is not None and challenges:
+            self._save_cached_challenges(cache_file, challenges)
+
+        return challenges
+
+    def _load_cached_challenges(self, cache_file: Path) -> Optional[List[Challenge]]:
+        """Load previously generated challenges, returning None on miss."""
+        if not cache_file.exists():
+            return None
+        try:
+            return [Challenge(**data) for data in json.loads(cache_file.read_text())]
+        except Exception:
+            return None
+
+    def _save_cached_challenges(self, cache_file: Path, challenges: List[Challenge]) -> None:
+        """Persist generated challenges so later runs skip the LLM pass."""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            cache_file.write_text(json.dumps([c.model_dump() for c in challenges]))
+        except Exception:
+            # Caching is best-effort; never fail generation over it
+            pass
     
     def validate(self) -> bool:
         """Validate that this level is properly configured.
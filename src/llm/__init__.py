@@ -1,7 +1,27 @@
 """LLM client module."""
 
 from .client import LLMClient
-from .prompts import SYSTEM_PROMPT, format_challenge_prompt
+from .prompts import (
+    SYSTEM_PROMPT,
+    build_messages,
+    format_challenge_prompt,
+    format_batch_challenge_prompt,
+    pack_batch,
+    parse_batch_response,
+)
 from .generation import SyntheticChallengeGenerator
+from .batch_submit import submit_batch
+from .cache import SemanticCache
 
-__all__ = ["LLMClient", "SYSTEM_PROMPT", "format_challenge_prompt", "SyntheticChallengeGenerator"]
\ No newline at end of file
+__all__ = [
+    "LLMClient",
+    "SYSTEM_PROMPT",
+    "build_messages",
+    "format_challenge_prompt",
+    "format_batch_challenge_prompt",
+    "pack_batch",
+    "parse_batch_response",
+    "SyntheticChallengeGenerator",
+    "submit_batch",
+    "SemanticCache",
+]
\ No newline at end of file
@@ -0,0 +1,98 @@
+"""Batch API submission for offline benchmark runs."""
+
+import io
+import json
+import time
+from typing import Dict, List
+
+from ..models import Challenge, ModelConfig
+from .prompts import build_messages
+
+# Batch statuses that mean the job is still being processed
+_PENDING_STATUSES = ("validating", "in_progress", "finalizing")
+
+
+def build_batch_lines(challenges: List[Challenge], model_config: ModelConfig) -> List[str]:
+    """Serialize (model, challenge) tasks to Batch API JSONL lines.
+
+    Args:
+        challenges: Challenges to submit
+        model_config: Model to run them against
+
+    Returns:
+        One JSONL line per challenge, keyed by challenge id as custom_id
+    """
+    lines = []
+    for challenge in challenges:
+        # Plain messages here: per-request cache_control markers are not
+        # valid inside batch bodies
+        body = {
+            "model": model_config.name,
+            "messages": build_messages(challenge),
+            "temperature": model_config.temperature,
+            "max_tokens": model_config.max_tokens,
+        }
+        lines.append(json.dumps({
+            "custom_id": challenge.id,
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": body,
+        }))
+    return lines
+
+
+def submit_batch(
+    openai_client,
+    challenges: List[Challenge],
+    model_config: ModelConfig,
+    poll_interval: int = 60,
+) -> Dict[str, str]:
+    """Run challenges through the asynchronous Batch API.
+
+    Uploads all tasks as one JSONL file, polls until the batch settles,
+    then maps responses back by custom_id. Batch jobs run at half price,
+    which suits offline evaluations that don't need interactive latency.
+
+    Args:
+        openai_client: The underlying OpenAI client
+        challenges: Challenges to submit
+        model_config: Model to run them against
+        poll_interval: Seconds between status polls
+
+    Returns:
+        Mapping of challenge id to response text; challenges whose
+        request failed are absent
+
+    Raises:
+        Exception: If the batch ends in a non-completed state
+    """
+    payload = "\n".join(build_batch_lines(challenges, model_config)).encode()
+    input_file = openai_client.files.create(
+        file=io.BytesIO(payload), purpose="batch"
+    )
+
+    batch = openai_client.batches.create(
+        input_file_id=input_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h",
+    )
+
+    while batch.status in _PENDING_STATUSES:
+        time.sleep(poll_interval)
+        batch = openai_client.batches.retrieve(batch.id)
+
+    if batch.status != "completed" or not batch.output_file_id:
+        raise Exception(f"Batch {batch.id} ended with status {batch.status}")
+
+    responses: Dict[str, str] = {}
+    output = openai_client.files.content(batch.output_file_id)
+    for line in output.text.splitlines():
+        if not line.strip():
+            continue
+        entry = json.loads(line)
+        response = entry.get("response") or {}
+        if response.get("status_code") == 200:
+            content = response["body"]["choices"][0]["message"]["content"] or ""
+            responses[entry["custom_id"]] = content
+
+    return responses
@@ -0,0 +1,128 @@
+"""Semantic response cache for LLM calls."""
+
+import hashlib
+import json
+import math
+from pathlib import Path
+from typing import List, Optional
+
+
+class SemanticCache:
+    """Reuse responses for prompts that are near-duplicates.
+
+    Challenge descriptions repeat with small wording changes across
+    levels and reruns, so an exact-hash cache misses them. This cache
+    embeds each prompt and returns a stored response when the cosine
+    similarity against a previous prompt for the same model and
+    temperature clears the threshold. Exact SHA-256 hits are checked
+    first so identical prompts never pay for an embedding call.
+
+    Entries persist as JSON in the shared cache directory; everything is
+    best-effort and a broken cache never fails a generation.
+    """
+
+    def __init__(
+        self,
+        openai_client,
+        embedding_model: str = "text-embedding-3-small",
+        threshold: float = 0.92,
+        cache_dir: Path = Path(".yarabench_cache"),
+    ):
+        """Initialize the semantic cache.
+
+        Args:
+            openai_client: Client used for embedding calls
+            embedding_model: Embedding model name
+            threshold: Minimum cosine similarity for a hit
+            cache_dir: Directory holding the persisted entries
+        """
+        self.openai_client = openai_client
+        self.embedding_model = embedding_model
+        self.threshold = threshold
+        self.cache_file = cache_dir / "semantic_cache.json"
+        self.entries = self._load_entries()
+
+    def _load_entries(self) -> List[dict]:
+        """Load persisted cache entries, tolerating a missing/broken file."""
+        try:
+            return json.loads(self.cache_file.read_text())
+        except Exception:
+            return []
+
+    def _save_entries(self) -> None:
+        """Persist the entries; caching is best-effort."""
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            self.cache_file.write_text(json.dumps(self.entries))
+        except Exception:
+            pass
+
+    def _embed(self, text: str) -> Optional[List[float]]:
+        """Embed a prompt, returning None if the call fails."""
+        try:
+            response = self.openai_client.embeddings.create(
+                model=self.embedding_model, input=text
+            )
+            return response.data[0].embedding
+        except Exception:
+            return None
+
+    @staticmethod
+    def _cosine(a: List[float], b: List[float]) -> float:
+        """Cosine similarity between two embedding vectors."""
+        dot = sum(x * y for x, y in zip(a, b))
+        norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+        return dot / norm if norm else 0.0
+
+    @staticmethod
+    def _prompt_sha(prompt: str) -> str:
+        """Exact-match key for a prompt."""
+        return hashlib.sha256(prompt.encode()).hexdigest()
+
+    def get(self, prompt: str, model_name: str, temperature: float) -> Optional[str]:
+        """Look up a response for a prompt, returning None on miss.
+
+        Exact hash matches are tried first (no embedding cost); otherwise
+        the prompt is embedded and compared against stored entries for
+        the same model and temperature.
+        """
+        sha = self._prompt_sha(prompt)
+        candidates = [
+            entry for entry in self.entries
+            if entry["model"] == model_name and entry["temperature"] == temperature
+        ]
+
+        for entry in candidates:
+            if entry["sha"] == sha:
+                return entry["response"]
+
+        if not candidates:
+            return None
+
+        embedding = self._embed(prompt)
+        if embedding is None:
+            return None
+
+        best_entry, best_score = None, 0.0
+        for entry in candidates:
+            score = self._cosine(embedding, entry["embedding"])
+            if score > best_score:
+                best_entry, best_score = entry, score
+
+        if best_entry is not None and best_score >= self.threshold:
+            return best_entry["response"]
+        return None
+
+    def set(self, prompt: str, model_name: str, temperature: float, response: str) -> None:
+        """Store a response keyed by the prompt's hash and embedding."""
+        embedding = self._embed(prompt)
+        if embedding is None:
+            return
+        self.entries.append({
+            "sha": self._prompt_sha(prompt),
+            "model": model_name,
+            "temperature": temperature,
+            "embedding": embedding,
+            "response": response,
+        })
+        self._save_entries()
@@ -1,108 +1,289 @@
 """OpenAI-compatible LLM client."""
 
+import hashlib
+import json
+import os
+import random
+import threading
 import time
+from pathlib import Path
 from typing import Optional
 
 from openai import OpenAI
+from pydantic.main import BaseModel
+
+# orjson speeds up the disk-cache round trip when available
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from ..models import ModelConfig, Challenge
-from .prompts import SYSTEM_PROMPT, format_challenge_prompt
+from .prompts import (
+    SYSTEM_PROMPT,
+    build_messages,
+    format_challenge_prompt,
+    format_batch_challenge_prompt,
+    parse_batch_response,
+)
+
+# One OpenAI client (and its httpx connection pool) per credentials/endpoint
+# pair, shared across LLMClient instances so connections are reused
+_client_cache: dict = {}
+_client_cache_lock = threading.Lock()
+
+
+def _get_openai_client(api_key: Optional[str], base_url: Optional[str]) -> OpenAI:
+    """Get or create the shared OpenAI client for an endpoint."""
+    key = (api_key, base_url)
+    with _client_cache_lock:
+        client = _client_cache.get(key)
+        if client is None:
+            client = _client_cache[key] = OpenAI(api_key=api_key, base_url=base_url)
+        return client
+
+
+class RuleResponse(BaseModel):
+    """Schema for structured rule-generation responses."""
+    rule: Optional[str]
+    not_actionable_reason: Optional[str]
+
+
+# response_format payload asking the provider to emit RuleResponse JSON;
+# structured responses skip fence/regex extraction downstream
+_RULE_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "rule_response",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "rule": {"type": ["string", "null"]},
+                "not_actionable_reason": {"type": ["string", "null"]},
+            },
+            "required": ["rule", "not_actionable_reason"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+
+def _unwrap_structured(content: str) -> str:
+    """Pull the rule (or the explanation) out of a structured response.
+
+    The schema guarantees well-formed JSON, so this replaces the
+    regex-based fence extraction downstream; malformed content falls
+    back to the raw text so the normal extractor still gets a chance.
+    """
+    try:
+        parsed = RuleResponse.model_validate_json(content)
+    except Exception:
+        return content
+    if parsed.rule:
+        return parsed.rule
+    return parsed.not_actionable_reason or ""
 
 
 class LLMClient:
     """OpenAI-compatible LLM client."""
-    
+
     def __init__(self, model_config: ModelConfig):
         """Initialize the LLM client.
-        
+
         Args:
             model_config: Model configuration
         """
         self.model_config = model_config
-        
-        # Initialize OpenAI client
-        self.client = OpenAI(
-            api_key=model_config.api_key or None,  # Will use env var if None
-            base_url=str(model_config.base_url) if model_config.base_url else None
+
+        # Initialize OpenAI client (shared per endpoint/credentials)
+        self.client = _get_openai_client(
+            model_config.api_key or None,  # Will use env var if None
+            str(model_config.base_url) if model_config.base_url else None
         )
+
+        # Opt-in response cache; identical prompts at temperature 0 are
+        # deterministic, so replays can skip the network entirely
+        cache_dir = os.getenv("YARABENCH_LLM_CACHE_DIR")
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+
+    def _cache_key(self, prompt: str) -> str:
+        """Build a stable cache key for a prompt against this model."""
+        raw = f"{self.model_config.name}|{self.model_config.temperature}|{SYSTEM_PROMPT}|{prompt}"
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def _cache_get(self, key: str) -> Optional[str]:
+        """Look up a cached response, returning None on miss."""
+        cache_file = self.cache_dir / f"{key}.json"
+        if not cache_file.exists():
+            return None
+        try:
+            if orjson is not None:
+                return orjson.loads(cache_file.read_bytes())["response"]
+            return json.loads(cache_file.read_text())["response"]
+        except Exception:
+            return None
+
+    def _cache_set(self, key: str, response: str) -> None:
+        """Store a response in the cache directory."""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            cache_file = self.cache_dir / f"{key}.json"
+            if orjson is not None:
+                cache_file.write_bytes(orjson.dumps({"response": response}))
+            else:
+                cache_file.write_text(json.dumps({"response": response}))
+        except Exception:
+            # Caching is best-effort; never fail a generation over it
+            pass
     
-    def generate_rule(self, challenge: Challenge, retry_count: int = 0) -> str:
+    def generate_rule(self, challenge: Challenge) -> str:
         """Generate a YARA rule for the given challenge.
-        
+
         Args:
             challenge: The challenge to generate a rule for
-            retry_count: Current retry attempt
-            
+
         Returns:
             Generated response
-            
+
         Raises:
             Exception: If generation fails after retries
         """
         prompt = format_challenge_prompt(challenge)
-        
-        try:
-            response = self.client.chat.completions.create(
-                model=self.model_config.name,
-                messages=[
-                    {"role": "system", "content": SYSTEM_PROMPT},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=self.model_config.temperature,
-                max_tokens=self.model_config.max_tokens,
-                timeout=self.model_config.timeout
-            )
-            
-            return response.choices[0].message.content or ""
-            
-        except Exception as e:
-            # Retry logic
-            max_retries = getattr(self.model_config, 'max_retries', 3)
-            retry_delay = getattr(self.model_config, 'retry_delay', 1.0)
-            
-            if retry_count < max_retries:
-                # Exponential backoff
-                delay = retry_delay * (2 ** retry_count)
-                time.sleep(delay)
-                return self.generate_rule(challenge, retry_count + 1)
-            else:
-                raise Exception(f"Failed to generate rule after {max_retries} retries: {str(e)}")
-    
-    def generate_rule_description(self, prompt: str, retry_count: int = 0) -> str:
+
+        # Only temperature-0 responses are deterministic enough to cache
+        cache_key = None
+        if self.cache_dir is not None and self.model_config.temperature == 0:
+            cache_key = self._cache_key(prompt)
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                return cached
+
+        # Prompt and messages are built once; retries only repeat the call.
+        # The static system prompt leads so provider prompt caching applies
+        messages = build_messages(
+            challenge, prompt_cache=getattr(self.model_config, 'prompt_cache', False)
+        )
+
+        max_retries = getattr(self.model_config, 'max_retries', 3)
+        retry_delay = getattr(self.model_config, 'retry_delay', 1.0)
+        last_error = None
+
+        structured = getattr(self.model_config, 'structured_output', False)
+        extra_kwargs = {"response_format": _RULE_RESPONSE_FORMAT} if structured else {}
+
+        for attempt in range(max_retries + 1):
+            try:
+                response = self.client.chat.completions.create(
+                    model=self.model_config.name,
+                    messages=messages,
+                    temperature=self.model_config.temperature,
+                    max_tokens=self.model_config.max_tokens,
+                    timeout=self.model_config.timeout,
+                    **extra_kwargs
+                )
+
+                content = response.choices[0].message.content or ""
+                if structured:
+                    content = _unwrap_structured(content)
+
+                if cache_key is not None:
+                    self._cache_set(cache_key, content)
+
+                return content
+
+            except Exception as e:
+                last_error = e
+                if attempt < max_retries:
+                    # Exponential backoff with a little jitter
+                    time.sleep(retry_delay * (2 ** attempt) + random.uniform(0, 0.1))
+
+        raise Exception(f"Failed to generate rule after {max_retries} retries: {str(last_error)}")
+
+    def generate_rules_batch(self, challenges: list) -> list:
+        """Generate rules for several challenges with one API call.
+
+        The challenges are combined into a single labelled prompt and the
+        response is split back into per-challenge answers, cutting round
+        trips (and repeated system-prompt tokens) by the batch size.
+
+        Args:
+            challenges: Challenges to generate rules for, in order
+
+        Returns:
+            Per-challenge response text aligned with the input order;
+            slots the model skipped are None
+
+        Raises:
+            Exception: If the batched call fails after retries
+        """
+        prompt = format_batch_challenge_prompt(challenges)
+
+        messages = [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ]
+
+        max_retries = getattr(self.model_config, 'max_retries', 3)
+        retry_delay = getattr(self.model_config, 'retry_delay', 1.0)
+        last_error = None
+
+        for attempt in range(max_retries + 1):
+            try:
+                response = self.client.chat.completions.create(
+                    model=self.model_config.name,
+                    messages=messages,
+                    temperature=self.model_config.temperature,
+                    # The batch needs room for one rule per challenge
+                    max_tokens=self.model_config.max_tokens * len(challenges),
+                    timeout=self.model_config.timeout
+                )
+
+                content = response.choices[0].message.content or ""
+                return parse_batch_response(content, len(challenges))
+
+            except Exception as e:
+                last_error = e
+                if attempt < max_retries:
+                    # Exponential backoff with a little jitter
+                    time.sleep(retry_delay * (2 ** attempt) + random.uniform(0, 0.1))
+
+        raise Exception(f"Failed to generate batch after {max_retries} retries: {str(last_error)}")
+
+    def generate_rule_description(self, prompt: str) -> str:
         """Generate text response for synthetic challenge generation.
-        
+
         Args:
             prompt: The prompt to send
-            retry_count: Current retry attempt
-            
+
         Returns:
             Generated response
-            
+
         Raises:
             Exception: If generation fails after retries
         """
-        try:
-            response = self.client.chat.completions.create(
-                model=self.model_config.name,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,  # Higher temperature for more creativity
-                max_tokens=self.model_config.max_tokens,
-                timeout=self.model_config.timeout
-            )
-            
-            return response.choices[0].message.content or ""
-            
-        except Exception as e:
-            # Retry logic
-            max_retries = getattr(self.model_config, 'max_retries', 3)
-            retry_delay = getattr(self.model_config, 'retry_delay', 1.0)
-            
-            if retry_count < max_retries:
-                # Exponential backoff
-                delay = retry_delay * (2 ** retry_count)
-                time.sleep(delay)
-                return self.generate_rule_description(prompt, retry_count + 1)
-            else:
-                raise Exception(f"Failed to generate description after {max_retries} retries: {str(e)}")
\ No newline at end of file
+        messages = [{"role": "user", "content": prompt}]
+
+        max_retries = getattr(self.model_config, 'max_retries', 3)
+        retry_delay = getattr(self.model_config, 'retry_delay', 1.0)
+        last_error = None
+
+        for attempt in range(max_retries + 1):
+            try:
+                response = self.client.chat.completions.create(
+                    model=self.model_config.name,
+                    messages=messages,
+                    temperature=0.7,  # Higher temperature for more creativity
+                    max_tokens=self.model_config.max_tokens,
+                    timeout=self.model_config.timeout
+                )
+
+                return response.choices[0].message.content or ""
+
+            except Exception as e:
+                last_error = e
+                if attempt < max_retries:
+                    # Exponential backoff with a little jitter
+                    time.sleep(retry_delay * (2 ** attempt) + random.uniform(0, 0.1))
+
+        raise Exception(f"Failed to generate description after {max_retries} retries: {str(last_error)}")
\ No newline at end of file
@@ -3,11 +3,26 @@
 import base64
 import json
 import random
+import re
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional, Dict, Any
 
+# orjson parses the LLM's JSON payloads several times faster than stdlib json
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
 from ..models import Challenge, TestFile, ChallengeLevel
 from ..utils import SeedGenerator
 
+# Strips markdown code fences in one pass instead of chained .replace calls
+_FENCE_RE = re.compile(r"^```(?:json)?\s*|\s*```$", re.MULTILINE)
+
+# Bound once; test-file generation encodes several payloads per challenge
+_b64encode = base64.b64encode
+
 
 class SyntheticChallengeGenerator:
     """Generate synthetic YARA rule challenges using LLM.
@@ -105,18 +120,24 @@ Focus on string-based detection rather than module-based analysis.""",
         Returns:
             List of generated challenges
         """
-        challenges = []
-        
-        for i in range(count):
+        challenge_ids = [f"l2_synthetic_{i+1:03d}" for i in range(count)]
+
+        def generate(challenge_id: str) -> Optional[Challenge]:
             try:
-                challenge = self._generate_single_challenge(f"l2_synthetic_{i+1:03d}")
-                if challenge:
-                    challenges.append(challenge)
+                return self._generate_single_challenge(challenge_id)
             except Exception as e:
-                print(f"Failed to generate challenge {i+1}: {e}")
-                continue
-        
-        return challenges
+                print(f"Failed to generate challenge {challenge_id}: {e}")
+                return None
+
+        # Generation is dominated by LLM round-trips, so dispatch the
+        # requests concurrently; executor.map preserves id order
+        if count > 1:
+            with ThreadPoolExecutor(max_workers=min(10, count)) as executor:
+                generated = list(executor.map(generate, challenge_ids))
+        else:
+            generated = [generate(challenge_id) for challenge_id in challenge_ids]
+
+        return [challenge for challenge in generated if challenge]
     
     def _generate_single_challenge(self, challenge_id: str) -> Optional[Challenge]:
         """Generate a single synthetic challenge.
@@ -145,13 +166,18 @@ Focus on string-based detection rather than module-based analysis.""",
             if not description:
                 return None
                 
-            # Build expected strings from all values (excluding keywords and description)
-            expected_strings = []
-            expected_keywords = challenge_data.get("expected_keywords", template["expected_keywords"].copy())
-            
-            for key, value in challenge_data.items():
-                if key not in ["description", "expected_keywords"] and isinstance(value, str):
-                    expected_strings.append(value)
+            # Build expected strings from all values (excluding keywords and
+            # description), deduplicated since the LLM may repeat a value
+            # across fields and every duplicate would be scanned for again
+            # by the validator; dict.fromkeys preserves first-seen order
+            expected_strings = list(dict.fromkeys(
+                value for key, value in challenge_data.items()
+                if key not in ("description", "expected_keywords")
+                and isinstance(value, str) and value
+            ))
+            expected_keywords = list(dict.fromkeys(
+                challenge_data.get("expected_keywords", template["expected_keywords"])
+            ))
             
             # Generate sophisticated test files
             test_files = self._generate_sophisticated_test_files(challenge_type, challenge_data, seed)
@@ -194,8 +220,8 @@ Focus on string-based detection rather than module-based analysis.""",
         try:
             response = self.llm_client.generate_rule_description(prompt).strip()
             # Clean response and parse JSON
-            clean_response = response.replace('```json', '').replace('```', '').strip()
-            return json.loads(clean_response)
+            clean_response = _FENCE_RE.sub('', response).strip()
+            return _loads(clean_response)
         except Exception as e:
             print(f"Failed to generate challenge with seed: {e}")
             return None
@@ -212,7 +238,11 @@ Focus on string-based detection rather than module-based analysis.""",
             List of test files
         """
         test_files = []
-        
+
+        # Draw both filler values up front; one pair of RNG calls per challenge
+        noise_a = random.randint(10000, 99999)
+        noise_b = random.randint(1000, 9999)
+
         # Create sophisticated matching file based on challenge type
         if challenge_type == "behavior_based":
             # Combine multiple indicators in a realistic way
@@ -222,7 +252,7 @@ Focus on string-based detection rather than module-based analysis.""",
             matching_content = f"Malware sample: {' | '.join(indicators[:2])} | Behavior: {seed.split(';')[0]}"
             test_files.append(TestFile(
                 name="malware_sample.bin",
-                content_b64=base64.b64encode(matching_content.encode()).decode(),
+                content_b64=_b64encode(matching_content.encode()).decode('ascii'),
                 should_match=True
             ))
             
@@ -236,7 +266,7 @@ Focus on string-based detection rather than module-based analysis.""",
             network_content = f"Connecting to {domain}:{port} | Protocol: {protocol_string} | Mutex: {mutex} | {seed.split(';')[0]}"
             test_files.append(TestFile(
                 name="network_comm.exe",
-                content_b64=base64.b64encode(network_content.encode()).decode(), 
+                content_b64=_b64encode(network_content.encode()).decode('ascii'), 
                 should_match=True
             ))
             
@@ -254,7 +284,7 @@ Focus on string-based detection rather than module-based analysis.""",
             
             test_files.append(TestFile(
                 name="file_dropper.dll",
-                content_b64=base64.b64encode(fs_content.encode()).decode(),
+                content_b64=_b64encode(fs_content.encode()).decode('ascii'),
                 should_match=True
             ))
             
@@ -268,24 +298,24 @@ Focus on string-based detection rather than module-based analysis.""",
             pe_content = f"PE File | Packer: {packer} | Import: {import_func} | Section: {section} | Version: {version} | {seed.split(';')[0]}"
             test_files.append(TestFile(
                 name="pe_sample.exe",
-                content_b64=base64.b64encode(pe_content.encode()).decode(),
+                content_b64=_b64encode(pe_content.encode()).decode('ascii'),
                 should_match=True
             ))
         
         # Generate a sophisticated non-matching file that shares some structure but lacks key indicators
-        non_matching_content = f"Legitimate software | Random data {random.randint(10000, 99999)} | Normal operation"
+        non_matching_content = f"Legitimate software | Random data {noise_a} | Normal operation"
         test_files.append(TestFile(
             name="legitimate.exe",
-            content_b64=base64.b64encode(non_matching_content.encode()).decode(),
+            content_b64=_b64encode(non_matching_content.encode()).decode('ascii'),
             should_match=False
         ))
         
         # Add a second non-matching file with partial indicators (edge case)
         partial_indicators = list(challenge_data.values())[:1] if challenge_data.values() else ["benign"]
-        partial_content = f"Partial match test: {partial_indicators[0] if partial_indicators else 'benign'} but missing other indicators {random.randint(1000, 9999)}"
+        partial_content = f"Partial match test: {partial_indicators[0] if partial_indicators else 'benign'} but missing other indicators {noise_b}"
         test_files.append(TestFile(
             name="partial_match.bin",
-            content_b64=base64.b64encode(partial_content.encode()).decode(),
+            content_b64=_b64encode(partial_content.encode()).decode('ascii'),
             should_match=False
         ))
         
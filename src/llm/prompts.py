@@ -1,5 +1,15 @@
 """Prompts for LLM interactions."""
 
+import re
+from typing import Iterator, List, Optional
+
+# tiktoken gives exact token counts for budget packing; without it a
+# conservative characters-per-token estimate is used instead
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
 from ..models import Challenge
 
 
@@ -18,23 +28,210 @@ If the description is not actionable or cannot be effectively detected with a YA
 
 Always provide just the YARA rule without additional explanation unless the task is not suitable for YARA detection."""
 
+# Prompts keyed by the content the prompt is built from. Ids are not a
+# safe key: level-2 synthetic ids repeat across generations with
+# different content. The frozen Challenge model itself is unhashable
+# (list fields), which rules out lru_cache over the model, so the key
+# is an explicit tuple of the fields _build_prompt reads.
+_prompt_cache: dict = {}
+_PROMPT_CACHE_MAX = 256
+
 
 def format_challenge_prompt(challenge: Challenge) -> str:
     """Format a challenge into a prompt for the LLM.
-    
+
+    Prompts are memoized by challenge content, so repeated generations
+    for the same challenge (multiple models, retries) skip the rebuild.
+
     Args:
         challenge: The challenge to format
-        
+
     Returns:
         Formatted prompt string
     """
-    prompt = f"Create a YARA rule based on the following description:\n\n{challenge.description}"
-    
+    key = (
+        challenge.description,
+        tuple(challenge.expected_strings),
+        tuple(challenge.expected_keywords),
+    )
+    prompt = _prompt_cache.get(key)
+    if prompt is None:
+        if len(_prompt_cache) >= _PROMPT_CACHE_MAX:
+            _prompt_cache.clear()
+        prompt = _prompt_cache[key] = _build_prompt(challenge)
+    return prompt
+
+
+def _build_prompt(challenge: Challenge) -> str:
+    """Assemble the prompt text for a challenge.
+
+    Parts are collected and joined once rather than concatenated
+    incrementally, so each hint costs one allocation instead of a
+    rebuild of the growing prompt.
+    """
+    parts = [
+        f"Create a YARA rule based on the following description:\n\n{challenge.description}"
+    ]
+
     # Add hints about expected features if available
     if challenge.expected_strings:
-        prompt += f"\n\nHint: The rule should detect these strings: {', '.join(repr(s) for s in challenge.expected_strings)}"
-    
+        parts.append(
+            "\n\nHint: The rule should detect these strings: "
+            + ", ".join(map(repr, challenge.expected_strings))
+        )
+
     if challenge.expected_keywords:
-        prompt += f"\n\nHint: Consider using these YARA features: {', '.join(challenge.expected_keywords)}"
-    
-    return prompt
\ No newline at end of file
+        parts.append(
+            "\n\nHint: Consider using these YARA features: "
+            + ", ".join(challenge.expected_keywords)
+        )
+
+    return "".join(parts)
+
+
+def build_messages(challenge: Challenge, prompt_cache: bool = False) -> List[dict]:
+    """Build the chat messages for a challenge.
+
+    The static SYSTEM_PROMPT always goes first and challenge-specific
+    text last, so providers that cache static prefixes (OpenAI does this
+    automatically) can reuse the prefill across calls. With prompt_cache
+    set, the system message additionally carries the explicit
+    cache_control marker Anthropic-compatible endpoints expect.
+
+    Args:
+        challenge: The challenge to build messages for
+        prompt_cache: Attach an explicit cache_control marker
+
+    Returns:
+        Messages list ready for a chat-completions call
+    """
+    if prompt_cache:
+        system = {
+            "role": "system",
+            "content": SYSTEM_PROMPT,
+            "cache_control": {"type": "ephemeral"},
+        }
+    else:
+        system = {"role": "system", "content": SYSTEM_PROMPT}
+
+    return [system, {"role": "user", "content": format_challenge_prompt(challenge)}]
+
+
+# Splits a batched response into labelled answer blocks; each block runs
+# to the next A[i] label or the end of the text
+_BATCH_ANSWER_RE = re.compile(r"A\[(\d+)\]:\s*(.*?)(?=\nA\[\d+\]:|\Z)", re.DOTALL)
+
+
+def format_batch_challenge_prompt(challenges: List[Challenge]) -> str:
+    """Format several challenges into a single batched prompt.
+
+    Each challenge is labelled Q[i] and the model is asked to answer
+    with matching A[i] blocks, so one API call covers the whole batch
+    and the shared system prompt is paid for once instead of k times.
+
+    Args:
+        challenges: The challenges to include, in answer order
+
+    Returns:
+        Formatted batch prompt string
+    """
+    instructions = (
+        f"Answer all {len(challenges)} tasks below. For each task Q[i], respond "
+        "with a matching block starting with 'A[i]:' on its own line, containing "
+        "just the YARA rule wrapped in ```yara fences (or an explanation if the "
+        "task is not suitable for YARA detection)."
+    )
+    blocks = [
+        f"Q[{i}]:\n{format_challenge_prompt(challenge)}"
+        for i, challenge in enumerate(challenges, start=1)
+    ]
+    return instructions + "\n\n" + "\n\n".join(blocks)
+
+
+def parse_batch_response(text: str, k: int) -> List[Optional[str]]:
+    """Split a batched response back into per-challenge answers.
+
+    Args:
+        text: The model's response to a batch prompt
+        k: Number of challenges in the batch
+
+    Returns:
+        List of length k aligned with prompt order; slots the model
+        skipped or mislabelled are None so the caller can retry them
+        individually
+    """
+    answers: List[Optional[str]] = [None] * k
+    for match in _BATCH_ANSWER_RE.finditer(text):
+        index = int(match.group(1))
+        if 1 <= index <= k:
+            answers[index - 1] = match.group(2).strip()
+    return answers
+
+
+# Token count of the static system prompt per model, computed once; the
+# prompt never changes, so re-tokenizing it per batch is pure waste
+_SYS_TOKENS: dict = {}
+
+
+def _count_tokens(text: str, model: str) -> int:
+    """Count tokens for a model, estimating when tiktoken is unavailable.
+
+    The fallback of one token per three characters overestimates for
+    English text, which errs on the safe side for budget packing.
+    """
+    if tiktoken is not None:
+        try:
+            return len(tiktoken.encoding_for_model(model).encode(text))
+        except KeyError:
+            pass
+    return len(text) // 3 + 1
+
+
+def system_prompt_tokens(model: str) -> int:
+    """Token count of SYSTEM_PROMPT for a model, cached per model."""
+    tokens = _SYS_TOKENS.get(model)
+    if tokens is None:
+        tokens = _SYS_TOKENS[model] = _count_tokens(SYSTEM_PROMPT, model)
+    return tokens
+
+
+def pack_batch(
+    challenges: List[Challenge],
+    model: str,
+    max_tokens: int,
+    max_completion: int = 2000,
+    max_count: Optional[int] = None,
+) -> Iterator[List[Challenge]]:
+    """Greedily pack challenges into batches that fit a token budget.
+
+    Each batch leaves room for the system prompt plus a per-challenge
+    completion reserve (batched requests scale their completion budget
+    with the batch size), so requests stay under the model's context
+    window instead of failing with context-length errors at the largest
+    batch size.
+
+    Args:
+        challenges: Challenges to pack, in order
+        model: Model name, used for token counting
+        max_tokens: Model context window size
+        max_completion: Tokens reserved for each challenge's response
+        max_count: Optional cap on challenges per batch
+
+    Yields:
+        Lists of challenges, each within budget (an oversized single
+        challenge is yielded alone rather than dropped)
+    """
+    budget = max_tokens - system_prompt_tokens(model)
+
+    batch: List[Challenge] = []
+    used = 0
+    for challenge in challenges:
+        cost = _count_tokens(format_challenge_prompt(challenge), model) + max_completion
+        if batch and (used + cost > budget or len(batch) == max_count):
+            yield batch
+            batch, used = [], 0
+        batch.append(challenge)
+        used += cost
+
+    if batch:
+        yield batch
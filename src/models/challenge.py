@@ -1,8 +1,16 @@
 """Challenge data models for YaraBench."""
 
+import base64
 from enum import Enum
-from typing import List, Dict, Optional
-from pydantic import BaseModel, Field
+from functools import cached_property
+from typing import List, Dict, Optional, Tuple
+# Submodule imports skip pydantic's lazy top-level __getattr__ machinery
+from pydantic import field_serializer, field_validator
+from pydantic.config import ConfigDict
+from pydantic.fields import Field
+from pydantic.main import BaseModel
+
+from ..utils import decode_base64
 
 
 class ChallengeLevel(str, Enum):
@@ -14,14 +22,50 @@ class ChallengeLevel(str, Enum):
 
 class TestFile(BaseModel):
     """A test file for evaluating YARA rules."""
+    # Test files never change after loading; freezing guards the decoded
+    # content against accidental mutation. Loading still accepts the
+    # content_b64 wire name alongside the field name.
+    model_config = ConfigDict(frozen=True, populate_by_name=True)
+
     name: str = Field(..., description="Filename for display")
-    content_b64: str = Field(..., description="Base64-encoded file content")
+    content: bytes = Field(
+        ...,
+        alias="content_b64",
+        description="File content (base64-encoded on the wire)"
+    )
     should_match: bool = Field(..., description="Whether the YARA rule should match this file")
     metadata: Dict[str, str] = Field(default_factory=dict, description="Additional metadata")
 
+    @field_validator("content", mode="before")
+    @classmethod
+    def _decode_content(cls, value):
+        """Decode base64 input once at load time.
+
+        Raw bytes are the canonical in-memory form, so evaluation sites
+        read content directly with no per-rule decode; broken padding is
+        repaired the same way it always was.
+        """
+        if isinstance(value, (bytes, bytearray)):
+            return bytes(value)
+        return decode_base64(value)
+
+    @field_serializer("content")
+    def _encode_content(self, value: bytes) -> str:
+        """Serialize content back to its base64 wire form."""
+        return base64.b64encode(value).decode('ascii')
+
+    @property
+    def content_b64(self) -> str:
+        """Base64 view of the content, for callers on the old field."""
+        return base64.b64encode(self.content).decode('ascii')
+
 
 class Challenge(BaseModel):
     """A YARA rule generation challenge."""
+    # Challenges are immutable once loaded, which keeps the cached
+    # counts and flags below trustworthy for the whole run
+    model_config = ConfigDict(use_enum_values=True, frozen=True)
+
     id: str = Field(..., description="Unique challenge identifier")
     level: ChallengeLevel = Field(..., description="Challenge difficulty level")
     actionable: bool = Field(..., description="Whether the challenge is solvable by a YARA rule")
@@ -34,15 +78,31 @@ class Challenge(BaseModel):
         default_factory=list,
         description="YARA keywords that should be used (pe, filesize, etc.)"
     )
-    test_files: List[TestFile] = Field(
-        default_factory=list,
+    test_files: Tuple[TestFile, ...] = Field(
+        default_factory=tuple,
         description="Files to test the generated rule against"
     )
     metadata: Dict[str, str] = Field(
         default_factory=dict,
         description="Additional challenge metadata"
     )
-    
-    class Config:
-        """Pydantic config."""
-        use_enum_values = True
\ No newline at end of file
+
+    @cached_property
+    def n_expected_strings(self) -> int:
+        """Number of expected strings, cached for the scoring hot path."""
+        return len(self.expected_strings)
+
+    @cached_property
+    def n_expected_keywords(self) -> int:
+        """Number of expected keywords, cached for the scoring hot path."""
+        return len(self.expected_keywords)
+
+    @cached_property
+    def n_test_files(self) -> int:
+        """Number of test files, cached for the scoring hot path."""
+        return len(self.test_files)
+
+    @cached_property
+    def should_match_flags(self) -> tuple:
+        """Expected match flags aligned with test_files order."""
+        return tuple(test_file.should_match for test_file in self.test_files)
\ No newline at end of file
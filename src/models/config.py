@@ -1,11 +1,18 @@
 """Configuration models for YaraBench."""
 
 from typing import List, Optional
-from pydantic import BaseModel, Field, HttpUrl
+# Submodule imports skip pydantic's lazy top-level __getattr__ machinery
+# on the CLI startup path
+from pydantic.config import ConfigDict
+from pydantic.fields import Field
+from pydantic.main import BaseModel
+from pydantic.networks import HttpUrl
 
 
 class ModelConfig(BaseModel):
     """Configuration for an LLM model."""
+    model_config = ConfigDict(frozen=True)
+
     name: str = Field(..., description="Model name (e.g., 'gpt-4o')")
     base_url: Optional[HttpUrl] = Field(
         None,
@@ -16,12 +23,29 @@ class ModelConfig(BaseModel):
         description="API key (can also use environment variable)"
     )
     temperature: float = Field(0.0, description="Model temperature")
+    structured_output: bool = Field(
+        False,
+        description="Request rules via JSON-schema structured outputs "
+                    "instead of free-form text extraction"
+    )
+    prompt_cache: bool = Field(
+        False,
+        description="Mark the static system prompt for provider-side caching "
+                    "(Anthropic-style cache_control; OpenAI caches automatically)"
+    )
     max_tokens: int = Field(2000, description="Maximum tokens to generate")
+    context_window: int = Field(
+        128000,
+        description="Model context window, used to pack batched requests "
+                    "under the token budget"
+    )
     timeout: int = Field(30, description="Request timeout in seconds")
 
 
 class Config(BaseModel):
     """Main configuration for YaraBench."""
+    model_config = ConfigDict(frozen=True)
+
     models: List[ModelConfig] = Field(..., description="Models to benchmark")
     levels: List[str] = Field(
         default_factory=lambda: ["level1"],
@@ -31,6 +55,10 @@ class Config(BaseModel):
         None,
         description="Optional LLM judge for evaluation"
     )
+    judge_batch_size: int = Field(
+        1,
+        description="Cases to combine per judge call (1 disables batching)"
+    )
     synthetic_count: int = Field(
         10,
         description="Number of synthetic challenges to generate for Level 2"
@@ -44,5 +72,35 @@ class Config(BaseModel):
         description="Output file path (for json/csv formats)"
     )
     verbose: bool = Field(False, description="Enable verbose output")
+    concurrency: int = Field(
+        8,
+        description="Number of challenges to evaluate concurrently per model"
+    )
+    batch_size: int = Field(
+        1,
+        description="Challenges to combine into one LLM request (1 disables batching)"
+    )
+    batch_api: bool = Field(
+        False,
+        description="Submit generations through the asynchronous Batch API "
+                    "(half-price, up to 24h turnaround)"
+    )
+    batch_poll_interval: int = Field(
+        60,
+        description="Seconds between Batch API status polls"
+    )
+    use_cache: bool = Field(
+        False,
+        description="Cache LLM responses on disk and reuse them across runs"
+    )
+    semantic_cache: bool = Field(
+        False,
+        description="Also reuse responses for near-duplicate prompts via "
+                    "embedding similarity"
+    )
+    cache_threshold: float = Field(
+        0.92,
+        description="Minimum cosine similarity for a semantic cache hit"
+    )
     max_retries: int = Field(3, description="Maximum retries for LLM calls")
     retry_delay: float = Field(1.0, description="Initial retry delay in seconds")
\ No newline at end of file
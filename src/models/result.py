@@ -1,8 +1,16 @@
 """Result data models for YaraBench."""
 
+from functools import partial
 from typing import Dict, List, Optional
-from datetime import datetime
-from pydantic import BaseModel, Field
+from datetime import datetime, timezone
+# Submodule imports skip pydantic's lazy top-level __getattr__ machinery
+from pydantic.config import ConfigDict
+from pydantic.fields import Field
+from pydantic.main import BaseModel
+
+# UTC timestamps skip the local-timezone resolution a naive datetime.now()
+# performs on every model instantiation
+_utcnow = partial(datetime.now, timezone.utc)
 
 
 class RuleResult(BaseModel):
@@ -30,11 +38,15 @@ class RuleResult(BaseModel):
     llm_judge_score: Optional[float] = Field(None, description="LLM judge score (0-1) if available")
     llm_judge_feedback: Optional[str] = Field(None, description="LLM judge feedback if available")
     llm_judge_details: Optional[Dict] = Field(None, description="Detailed LLM judge evaluation")
-    timestamp: datetime = Field(default_factory=datetime.now, description="When the evaluation ran")
+    timestamp: datetime = Field(default_factory=_utcnow, description="When the evaluation ran")
 
 
 class BenchmarkResult(BaseModel):
     """Result of running a full benchmark."""
+    # Aggregate results are write-once; RuleResult stays mutable since
+    # evaluation fills fields in stages
+    model_config = ConfigDict(frozen=True)
+
     model: str = Field(..., description="Model being benchmarked")
     levels: List[str] = Field(..., description="Challenge levels that were run")
     total_challenges: int = Field(..., description="Total number of challenges")
@@ -42,10 +54,4 @@ class BenchmarkResult(BaseModel):
     average_score: float = Field(..., description="Average score across all challenges")
     results: List[RuleResult] = Field(..., description="Individual challenge results")
     total_time_ms: float = Field(..., description="Total benchmark runtime in milliseconds")
-    timestamp: datetime = Field(default_factory=datetime.now, description="When the benchmark ran")
-    
-    class Config:
-        """Pydantic config."""
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
\ No newline at end of file
+    timestamp: datetime = Field(default_factory=_utcnow, description="When the benchmark ran")
\ No newline at end of file
@@ -1,8 +1,15 @@
 """Output modules for YaraBench."""
 
 from .base import OutputHandler
-from .terminal import TerminalOutput
 from .json_output import JSONOutput
 from .csv_output import CSVOutput
 
-__all__ = ["OutputHandler", "TerminalOutput", "JSONOutput", "CSVOutput"] 
\ No newline at end of file
+__all__ = ["OutputHandler", "TerminalOutput", "JSONOutput", "CSVOutput"]
+
+
+def __getattr__(name):
+    """Load TerminalOutput (and its rich dependency) on demand."""
+    if name == "TerminalOutput":
+        from .terminal import TerminalOutput
+        return TerminalOutput
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,47 +1,61 @@
 """Terminal output handler for YaraBench."""
 
 from typing import List
-from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
-from rich.text import Text
 
 from .base import OutputHandler
 from ..models import BenchmarkResult, RuleResult
 
-console = Console()
+# Console is created on first use so importing this module (or picking a
+# json/csv output) never pays for rich
+_console = None
+
+
+def _get_console():
+    """Get the shared rich console, creating it on first use."""
+    global _console
+    if _console is None:
+        from rich.console import Console
+        _console = Console()
+    return _console
 
 
 class TerminalOutput(OutputHandler):
     """Terminal output handler that displays results in the console."""
-    
+
     def write(self, results: List[BenchmarkResult]) -> None:
         """Write benchmark results to terminal.
-        
+
+        Everything is composed into one renderable and printed with a
+        single console call, so rich lays out and flushes once per run
+        instead of several times per model.
+
         Args:
             results: List of benchmark results to write
         """
         if not results:
-            console.print("[yellow]No results to display[/yellow]")
+            _get_console().print("[yellow]No results to display[/yellow]")
             return
-        
-        # Display summary table
-        self._show_summary(results)
-        
-        # Display detailed results for each model
-        for result in results:
-            self._show_model_details(result)
-    
-    def _show_summary(self, results: List[BenchmarkResult]) -> None:
-        """Show summary table of results."""
+
+        from rich.console import Group
+
+        renderable = Group(
+            self._summary_table(results),
+            *(self._model_details(result) for result in results),
+        )
+        _get_console().print(renderable)
+
+    def _summary_table(self, results: List[BenchmarkResult]):
+        """Build the summary table of results."""
+        from rich.table import Table
+
         table = Table(title="Benchmark Summary")
-        
+
         table.add_column("Model", style="cyan")
         table.add_column("Total", justify="right")
         table.add_column("Valid", justify="right", style="green")
         table.add_column("Score", justify="right")
         table.add_column("Time (s)", justify="right")
-        
+
         for result in results:
             table.add_row(
                 result.model,
@@ -50,14 +64,16 @@ class TerminalOutput(OutputHandler):
                 f"{result.average_score:.2f}",
                 f"{result.total_time_ms / 1000:.1f}"
             )
-        
-        console.print("\n")
-        console.print(table)
-    
-    def _show_model_details(self, result: BenchmarkResult) -> None:
-        """Show detailed results for a specific model."""
-        console.print(f"\n[bold cyan]Detailed Results for {result.model}[/bold cyan]")
-        
+
+        return table
+
+    def _model_details(self, result: BenchmarkResult):
+        """Build the detailed results group for a specific model."""
+        from rich.console import Group
+        from rich.panel import Panel
+        from rich.table import Table
+        from rich.text import Text
+
         # Create detailed table
         table = Table(title=f"Results for {result.model}")
         table.add_column("Challenge ID", style="dim")
@@ -65,11 +81,11 @@ class TerminalOutput(OutputHandler):
         table.add_column("Score", justify="right")
         table.add_column("Latency (ms)", justify="right")
         table.add_column("Error", style="red")
-        
+
         for rule_result in result.results:
             valid_status = "✅" if rule_result.valid_syntax else "❌"
             error_text = rule_result.error or ""
-            
+
             table.add_row(
                 rule_result.challenge_id,
                 valid_status,
@@ -77,9 +93,7 @@ class TerminalOutput(OutputHandler):
                 f"{rule_result.latency_ms:.1f}",
                 error_text
             )
-        
-        console.print(table)
-        
+
         # Show statistics
         stats_text = Text()
         stats_text.append(f"Total Challenges: {result.total_challenges}\n", style="white")
@@ -90,5 +104,9 @@ class TerminalOutput(OutputHandler):
             stats_text.append("Success Rate: N/A\n", style="blue")
         stats_text.append(f"Average Score: {result.average_score:.2f}\n", style="yellow")
         stats_text.append(f"Total Time: {result.total_time_ms/1000:.1f}s", style="magenta")
-        
-        console.print(Panel(stats_text, title="Statistics")) 
\ No newline at end of file
+
+        return Group(
+            f"\n[bold cyan]Detailed Results for {result.model}[/bold cyan]",
+            table,
+            Panel(stats_text, title="Statistics"),
+        )
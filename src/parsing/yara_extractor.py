@@ -1,358 +1,455 @@
 """Extract YARA rules from LLM responses."""
 
 import re
+from functools import lru_cache
 from typing import List, Optional, Tuple
 
+# pyahocorasick matches all indicator phrases in one automaton pass when
+# installed; the compiled alternation below covers the same set otherwise
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
 
-class YaraExtractor:
-    """Extract YARA rules from LLM-generated text."""
-    
-    # Patterns for finding YARA rules in code blocks
-    CODE_BLOCK_PATTERNS = [
+# Everything lives at module level: the extractor carries no state and is
+# never subclassed, so plain functions resolve internal calls with one
+# global lookup instead of classmethod binding plus MRO attribute lookup
+# on every call. The YaraExtractor class at the bottom remains the public
+# entry point.
+
+# Patterns for finding YARA rules in code blocks, compiled once at import
+# so the hot extraction path never hits re's pattern cache
+CODE_BLOCK_PATTERNS = [
+    re.compile(pattern, re.DOTALL | re.IGNORECASE)
+    for pattern in (
         r'```yara\s*\n(.*?)```',
         r'```\s*\n(.*?)```',
         r'```yaml\s*\n(.*?)```',  # Common typo
         r'```YARA\s*\n(.*?)```',
         r'```rule\s*\n(.*?)```',  # Sometimes they start with rule
-    ]
-    
-    # More robust patterns for finding complete YARA rules
-    YARA_RULE_PATTERNS = [
-        # Rule with imports (using manual brace counting)
-        r'((?:import\s+"[^"]+"\s*\n)*\s*rule\s+\w+\s*\{.*?\}\s*$)',
-        
-        # Standard rule with balanced braces (most robust)
-        r'(rule\s+\w+\s*\{(?:[^{}]*\{[^{}]*\})*[^{}]*\})',
-        
-        # Rule with meta, strings, and condition sections (allow nested braces)
-        r'(rule\s+\w+\s*\{.*?(?:meta:|strings:|condition:).*?\}\s*$)',
-        
-        # Fallback: any rule structure with basic components
-        r'(rule\s+\w+[^{]*\{.*?condition:.*?\}\s*$)',
-    ]
-    
-    # Pattern for detecting valid YARA rule structure
-    VALID_RULE_STRUCTURE = re.compile(
-        r'(?:(?:import\s+"[^"]+"\s*\n)*\s*)?rule\s+\w+\s*\{.*?condition:\s*.*?\}',
-        re.DOTALL | re.IGNORECASE
     )
-    
-    # Indicators that no rule is needed
-    NO_RULE_INDICATORS = [
-        "not actionable",
-        "cannot be detected",
-        "no yara rule",
-        "not possible",
-        "cannot create",
-        "not suitable",
-        "beyond yara",
-        "beyond the capabilities",
-    ]
-    
-    @classmethod
-    def extract_rules(cls, response: str) -> List[str]:
-        """Extract all YARA rules from an LLM response.
-        
-        Args:
-            response: The full LLM response
-            
-        Returns:
-            List of extracted YARA rules
-        """
-        if not response:
-            return []
-        
-        # Check if response indicates no rule is needed
-        if cls._indicates_no_rule(response):
-            return []
-        
-        rules = []
-        
-        # First try to extract from code blocks
-        for pattern in cls.CODE_BLOCK_PATTERNS:
-            matches = re.findall(pattern, response, re.DOTALL | re.IGNORECASE)
-            for match in matches:
-                extracted = cls._extract_rules_from_text(match)
-                rules.extend(extracted)
-        
-        # If no rules found in code blocks, try direct extraction
-        if not rules:
-            rules.extend(cls._extract_rules_from_text(response))
-        
-        # Clean and validate rules, removing duplicates
-        cleaned_rules = []
-        seen_rules = set()
-        seen_rule_bodies = set()
-        
-        for rule in rules:
-            cleaned = cls._clean_rule(rule)
-            if cleaned and cls._validate_basic_structure(cleaned):
-                # Normalize for duplicate detection
-                normalized = re.sub(r'\s+', ' ', cleaned.strip())
-                # Extract just the rule body (without imports) for duplicate detection
-                rule_body_match = re.search(r'(rule\s+\w+\s*\{[^}]*\})', cleaned, re.DOTALL)
-                if rule_body_match:
-                    rule_body = re.sub(r'\s+', ' ', rule_body_match.group(1).strip())
-                    # If we've seen this rule body before, skip unless this version has imports
-                    if rule_body in seen_rule_bodies and 'import' not in cleaned:
-                        continue
-                    seen_rule_bodies.add(rule_body)
-                
-                if normalized not in seen_rules:
-                    seen_rules.add(normalized)
-                    cleaned_rules.append(cleaned)
-        
-        return cleaned_rules
-    
-    @classmethod
-    def _indicates_no_rule(cls, response: str) -> bool:
-        """Check if response indicates no rule is needed."""
-        response_lower = response.lower()
-        return any(indicator in response_lower for indicator in cls.NO_RULE_INDICATORS)
-    
-    @classmethod
-    def _extract_rules_from_text(cls, text: str) -> List[str]:
-        """Extract YARA rules from plain text using multiple regex patterns."""
-        rules = []
-        
-        # Always try manual parsing first if there's a rule keyword
-        if "rule " in text.lower():
-            # Find all rule positions
-            rule_positions = []
-            text_lower = text.lower()
-            pos = 0
-            while True:
-                pos = text_lower.find("rule ", pos)
-                if pos == -1:
-                    break
-                rule_positions.append(pos)
-                pos += 5
-            
-            # Extract each rule
-            for i, start_pos in enumerate(rule_positions):
-                # Determine end position (either next rule or end of text)
-                end_pos = rule_positions[i + 1] if i + 1 < len(rule_positions) else len(text)
-                rule_text = text[start_pos:end_pos]
-                
-                manual_rule = cls._extract_rule_manual_parsing(rule_text)
-                if manual_rule and cls._is_valid_rule_structure(manual_rule):
-                    rules.append(manual_rule)
-        
-        # If no rules found with manual parsing, try regex patterns
-        if not rules:
-            for pattern in cls.YARA_RULE_PATTERNS:
-                matches = re.findall(pattern, text, re.DOTALL | re.IGNORECASE | re.MULTILINE)
-                for match in matches:
-                    if cls._is_valid_rule_structure(match):
-                        rules.append(match)
-        
-        return rules
-    
-    @classmethod
-    def _extract_rule_manual_parsing(cls, text: str) -> Optional[str]:
-        """Manually parse YARA rule with brace matching as fallback."""
-        rule_start = text.lower().find("rule ")
-        if rule_start == -1:
-            return None
-        
-        # Find the actual start (preserve case)
-        actual_start = rule_start
-        while actual_start > 0 and text[actual_start - 1] in ' \t':
-            actual_start -= 1
-        
-        # Check for imports before the rule
-        import_start = actual_start
-        lines_before = text[:actual_start].split('\n')
-        for i in range(len(lines_before) - 1, -1, -1):
-            line = lines_before[i].strip()
-            if line.startswith('import '):
-                import_start = text.find(lines_before[i])
-            elif line and not line.startswith('import '):
-                break
-        
-        # Find the matching closing brace
-        brace_count = 0
-        found_opening = False
-        end_pos = rule_start
-        in_string = False
-        in_regex = False
-        escape_next = False
-        
-        for i in range(rule_start, len(text)):
-            char = text[i]
-            
-            # Handle escape sequences
-            if escape_next:
-                escape_next = False
-                continue
-            
-            if char == '\\':
-                escape_next = True
-                continue
-            
-            # Handle string literals
-            if char == '"' and not in_regex:
-                in_string = not in_string
-            
-            # Handle regex literals
-            if char == '/' and not in_string:
-                in_regex = not in_regex
-            
-            # Only count braces outside of strings and regexes
-            if not in_string and not in_regex:
-                if char == '{':
-                    brace_count += 1
-                    found_opening = True
-                elif char == '}':
-                    brace_count -= 1
-                    if found_opening and brace_count == 0:
-                        end_pos = i + 1
-                        break
-        
-        if end_pos > rule_start and found_opening:
-            return text[import_start:end_pos]
-        
+]
+
+# Compiled helpers for cleanup and duplicate detection
+_RE_RULE_BODY = re.compile(r'(rule\s+\w+\s*\{[^}]*\})', re.DOTALL)
+_RE_MD_PREFIX = re.compile(r'^```.*?\n', re.MULTILINE)
+_RE_MD_SUFFIX = re.compile(r'\n```$')
+_RE_RULE_DECL = re.compile(r'rule\s+(\w+)\s*{')
+_RE_SECTION_NOCOLON_EOL = re.compile(r'^\s*(strings|condition|meta)\s*$', re.MULTILINE)
+_RE_SECTION_NOCOLON_MID = re.compile(r'^\s*(strings|condition|meta)\s+(?!:)', re.MULTILINE)
+_RE_DOLLAR_EQ = re.compile(r'\$(\w+)=')
+_RE_STRING_DEF_QUOTES = re.compile(r'(\$\w+\s*=\s*)"([^"]*)"')
+_RE_COMPLEX_STR = re.compile(r'(/[^/\n]*[\{\}][^/\n]*/|"[^"\n]*[\{\}][^"\n]*")')
+# Declaration-shaped only (name, optional tags, opening brace): a bare
+# "rule" inside a meta string or comment must not register as a rule
+_RE_RULE_HEADER = re.compile(
+    r'\brule\s+\w+(?:\s*:\s*\w+(?:\s+\w+)*)?\s*\{', re.IGNORECASE
+)
+# Tokens the brace scanner cares about; an escape consumes its
+# following character so the alternatives never see it
+_RE_BRACE_TOKENS = re.compile(r'\\.|["/{}]', re.DOTALL)
+
+# Indicators that no rule is needed
+NO_RULE_INDICATORS = [
+    "not actionable",
+    "cannot be detected",
+    "no yara rule",
+    "not possible",
+    "cannot create",
+    "not suitable",
+    "beyond yara",
+    "beyond the capabilities",
+]
+
+# Single-pass matcher over all NO_RULE_INDICATORS: an Aho-Corasick
+# automaton when available, else one case-insensitive alternation
+# (either way, one scan instead of eight substring passes)
+if ahocorasick is not None:
+    _NO_RULE_AC = ahocorasick.Automaton()
+    for _indicator in NO_RULE_INDICATORS:
+        _NO_RULE_AC.add_word(_indicator, _indicator)
+    _NO_RULE_AC.make_automaton()
+    del _indicator
+else:
+    _NO_RULE_AC = None
+_NO_RULE_RE = re.compile(
+    '|'.join(re.escape(indicator) for indicator in NO_RULE_INDICATORS),
+    re.IGNORECASE
+)
+
+
+def extract_rules(response: str) -> List[str]:
+    """Extract all YARA rules from an LLM response.
+
+    Args:
+        response: The full LLM response
+
+    Returns:
+        List of extracted YARA rules
+    """
+    return list(_extract_rules_cached(response))
+
+
+@lru_cache(maxsize=256)
+def _extract_rules_cached(response: str) -> Tuple[str, ...]:
+    """Full extraction, memoized per response.
+
+    Extraction is pure over the response text, so repeated calls on
+    the same response (cache replays, retries) hit the memo instead
+    of re-running the parser. The tuple keeps cached values immutable.
+    """
+    return tuple(_iter_rules(response))
+
+
+def _iter_rules(response: str):
+    """Yield cleaned, validated, deduplicated rules one at a time.
+
+    Lazy by design: a caller that only wants the first rule stops the
+    pipeline before later code blocks and rule declarations are parsed.
+    """
+    if not response:
+        return
+
+    # Check if response indicates no rule is needed
+    if _indicates_no_rule(response):
+        return
+
+    seen_rules = set()
+    seen_rule_bodies = set()
+
+    for rule in _iter_candidates(response):
+        cleaned = _clean_rule(rule)
+        if cleaned and _validate_basic_structure(cleaned):
+            # Normalize for duplicate detection (split/join collapses
+            # whitespace in one C pass, no regex involved)
+            normalized = ' '.join(cleaned.split())
+            # Extract just the rule body (without imports) for duplicate detection
+            rule_body_match = _RE_RULE_BODY.search(cleaned)
+            if rule_body_match:
+                rule_body = ' '.join(rule_body_match.group(1).split())
+                # If we've seen this rule body before, skip unless this version has imports
+                if rule_body in seen_rule_bodies and 'import' not in cleaned:
+                    continue
+                seen_rule_bodies.add(rule_body)
+
+            if normalized not in seen_rules:
+                seen_rules.add(normalized)
+                yield cleaned
+
+
+def _iter_candidates(response: str):
+    """Yield raw rule candidates: code blocks first, then direct text."""
+    found = False
+    for pattern in CODE_BLOCK_PATTERNS:
+        for match in pattern.finditer(response):
+            for rule in _extract_rules_from_text(match.group(1)):
+                found = True
+                yield rule
+
+    # If no rules found in code blocks, try direct extraction
+    if not found:
+        yield from _extract_rules_from_text(response)
+
+
+def _indicates_no_rule(response: str) -> bool:
+    """Check if response indicates no rule is needed."""
+    if _NO_RULE_AC is not None:
+        return next(_NO_RULE_AC.iter(response.lower()), None) is not None
+    return _NO_RULE_RE.search(response) is not None
+
+
+def _extract_rules_from_text(text: str) -> List[str]:
+    """Extract YARA rules from plain text via the brace-counting parser."""
+    # Fast path for the common clean case: the text is exactly one rule
+    # with nothing around it, so the position scan and brace counting
+    # below would only rediscover the text as-is
+    t = text.strip()
+    if (
+        t.startswith('rule ')
+        and t.endswith('}')
+        and _RE_RULE_HEADER.search(t, 5) is None
+        and _is_valid_rule_structure(t)
+    ):
+        return [t]
+
+    rules = []
+
+    # Walk declaration-shaped headers and hand each to the brace
+    # scanner, resuming past the extracted rule's closing brace. This
+    # never splits at a bare "rule" keyword inside a string literal,
+    # and headers quoted inside an extracted rule are skipped because
+    # the search restarts after its body. prev_end marks the consumed
+    # region so import lines above a rule are kept with it.
+    prev_end = 0
+    pos = 0
+    while True:
+        header = _RE_RULE_HEADER.search(text, pos)
+        if header is None:
+            break
+        rule, end_pos = _scan_rule(text, header.start(), prev_end)
+        if rule is None:
+            # Braces never balanced; skip this header and keep looking
+            pos = header.end()
+            continue
+        if _is_valid_rule_structure(rule):
+            rules.append(rule)
+            prev_end = end_pos
+        pos = end_pos
+
+    # The brace counter is deterministic and O(n); anything it cannot
+    # parse is not worth retrying with backtracking-prone regexes
+    return rules
+
+
+def _extract_rule_manual_parsing(text: str) -> Optional[str]:
+    """Manually parse YARA rule with brace matching as fallback."""
+    header = _RE_RULE_HEADER.search(text)
+    if header is None:
         return None
-    
-    @classmethod
-    def _is_valid_rule_structure(cls, rule: str) -> bool:
-        """Check if extracted text has valid YARA rule structure."""
-        if not rule or not rule.strip():
-            return False
-        
-        # Use compiled regex for efficiency
-        return bool(cls.VALID_RULE_STRUCTURE.search(rule))
-    
-    @classmethod
-    def _clean_rule(cls, rule: str) -> str:
-        """Clean and normalize a YARA rule."""
-        # Remove leading/trailing whitespace
-        rule = rule.strip()
-        
-        # Remove any remaining markdown artifacts
-        rule = re.sub(r'^```.*?\n', '', rule, flags=re.MULTILINE)
-        rule = re.sub(r'\n```$', '', rule)
-        
-        # Fix common indentation issues
-        lines = rule.split('\n')
-        if lines:
-            # Find minimum indentation (excluding empty lines and rule declaration)
-            min_indent = float('inf')
-            for i, line in enumerate(lines[1:], 1):  # Skip first line
-                if line.strip() and not line.strip().startswith('//'):
-                    indent = len(line) - len(line.lstrip())
-                    min_indent = min(min_indent, indent)
-            
-            # Remove common indentation
-            if min_indent != float('inf') and min_indent > 0:
-                cleaned_lines = [lines[0]]  # Keep first line as-is
-                for line in lines[1:]:
-                    if line.strip():
-                        cleaned_lines.append(line[min_indent:])
-                    else:
-                        cleaned_lines.append('')
-                rule = '\n'.join(cleaned_lines)
-        
-        # Fix common syntax issues
-        rule = cls._fix_common_syntax_issues(rule)
-        
-        return rule
-    
-    @classmethod
-    def _fix_common_syntax_issues(cls, rule: str) -> str:
-        """Fix common YARA syntax issues."""
-        # Ensure proper rule declaration spacing
-        rule = re.sub(r'rule\s+(\w+)\s*{', r'rule \1 {', rule)
-        
-        # Fix missing colons in section headers
-        rule = re.sub(r'^\s*(strings|condition|meta)\s*$', r'\1:', rule, flags=re.MULTILINE)
-        rule = re.sub(r'^\s*(strings|condition|meta)\s+(?!:)', r'\1:', rule, flags=re.MULTILINE)
-        
-        # Fix string definitions without proper spacing
-        rule = re.sub(r'\$(\w+)=', r'$\1 =', rule)
-        
-        # Fix common quote issues
-        rule = re.sub(r'(\$\w+\s*=\s*)"([^"]*)"', r'\1"\2"', rule)
-        
-        # Ensure proper section ordering (meta, strings, condition)
-        rule = cls._normalize_section_order(rule)
-        
-        return rule
-    
-    @classmethod
-    def _normalize_section_order(cls, rule: str) -> str:
-        """Ensure sections are in proper order: meta, strings, condition."""
-        # For rules with complex strings/regexes, skip normalization
-        # to avoid breaking the rule structure
-        if re.search(r'(/[^/\n]*[\{\}][^/\n]*/|"[^"\n]*[\{\}][^"\n]*")', rule):
-            return rule
-        
-        lines = rule.split('\n')
-        rule_header = []
-        meta_lines = []
-        strings_lines = []
-        condition_lines = []
-        current_section = None
-        brace_count = 0
-        
-        for line in lines:
-            stripped = line.strip()
-            
-            # Track rule header
-            if stripped.startswith('rule ') and '{' in stripped:
-                rule_header.append(line)
-                brace_count += line.count('{')
-                continue
-            elif not rule_header and not stripped:
-                continue
-            elif not rule_header:
-                rule_header.append(line)
-                continue
-            
-            # Track braces for end of rule
-            brace_count += line.count('{') - line.count('}')
-            if brace_count <= 0 and '}' in line:
-                # End of rule
-                if current_section == 'condition':
-                    condition_lines.append(line)
-                else:
-                    condition_lines.append(line)  # Closing brace
-                break
-            
-            # Determine section
-            if stripped.startswith('meta:'):
-                current_section = 'meta'
-                meta_lines.append(line)
-            elif stripped.startswith('strings:'):
-                current_section = 'strings'
-                strings_lines.append(line)
-            elif stripped.startswith('condition:'):
-                current_section = 'condition'
-                condition_lines.append(line)
-            else:
-                # Add to current section
-                if current_section == 'meta':
-                    meta_lines.append(line)
-                elif current_section == 'strings':
-                    strings_lines.append(line)
-                elif current_section == 'condition':
-                    condition_lines.append(line)
-                else:
-                    # Default to rule header area
-                    rule_header.append(line)
-        
-        # Reconstruct rule
-        result = rule_header + meta_lines + strings_lines + condition_lines
-        return '\n'.join(result)
-    
-    @classmethod
-    def _validate_basic_structure(cls, rule: str) -> bool:
-        """Validate basic YARA rule structure."""
-        # Use our more sophisticated validation
-        return cls._is_valid_rule_structure(rule)
-    
-    @classmethod
-    def extract_single_rule(cls, response: str) -> Optional[str]:
-        """Extract a single YARA rule from response (returns first valid rule)."""
-        rules = cls.extract_rules(response)
-        return rules[0] if rules else None
\ No newline at end of file
+    return _scan_rule(text, header.start(), 0)[0]
+
+
+def _scan_rule(text: str, rule_start: int, region_start: int) -> Tuple[Optional[str], int]:
+    """Scan one rule body from a declaration at rule_start.
+
+    Returns the rule text (with any import lines directly above it,
+    back to region_start at most) and the position just past its
+    closing brace, or (None, rule_start) if the braces never balance.
+    """
+    # Find the actual start (preserve case)
+    actual_start = rule_start
+    while actual_start > region_start and text[actual_start - 1] in ' \t':
+        actual_start -= 1
+
+    # Check for imports before the rule, tracking line offsets so the
+    # slice starts at the right occurrence even for repeated lines
+    import_start = actual_start
+    offset = actual_start
+    for line in reversed(text[region_start:actual_start].split('\n')):
+        line_begin = offset - len(line)
+        stripped = line.strip()
+        if stripped.startswith('import '):
+            import_start = line_begin
+        elif stripped:
+            break
+        offset = line_begin - 1  # step over the preceding newline
+
+    # Find the matching closing brace. Only the structural tokens
+    # (escapes, quotes, slashes, braces) are visited; the regex
+    # engine skips everything between them at C speed
+    brace_count = 0
+    found_opening = False
+    end_pos = rule_start
+    in_string = False
+    in_regex = False
+
+    for match in _RE_BRACE_TOKENS.finditer(text, rule_start):
+        char = match.group()
+
+        # Escape sequences are the only two-character tokens, and they
+        # are inert; the length test avoids slicing out char[0]
+        if len(char) == 2:
+            continue
+
+        # Handle string literals
+        if char == '"' and not in_regex:
+            in_string = not in_string
+
+        # Handle regex literals
+        if char == '/' and not in_string:
+            in_regex = not in_regex
+
+        # Only count braces outside of strings and regexes
+        if not in_string and not in_regex:
+            if char == '{':
+                brace_count += 1
+                found_opening = True
+            elif char == '}':
+                brace_count -= 1
+                if found_opening and brace_count == 0:
+                    end_pos = match.end()
+                    break
+
+    if end_pos > rule_start and found_opening:
+        return text[import_start:end_pos], end_pos
+
+    return None, rule_start
+
+
+def _is_valid_rule_structure(rule: str) -> bool:
+    """Check if extracted text has valid YARA rule structure.
+
+    Runs as ordered substring scans instead of a DOTALL regex, so
+    validation stays linear even on adversarial non-rule text.
+    """
+    if not rule or rule.isspace():
+        return False
+
+    header = _RE_RULE_HEADER.search(rule)
+    if not header:
+        return False
+    rule_lower = rule.lower()
+    condition = rule_lower.find('condition:', header.end())
+    if condition == -1:
+        return False
+    return rule_lower.rfind('}') > condition
+
+
+def _clean_rule(rule: str) -> str:
+    """Clean and normalize a YARA rule.
+
+    The rule is split into lines once: a first pass measures common
+    indentation and checks for strings/regexes that make section
+    reordering unsafe, and a second pass dedents, applies the
+    per-line syntax fixes, and regroups sections into meta, strings,
+    condition order.
+    """
+    # Remove leading/trailing whitespace and markdown artifacts
+    rule = rule.strip()
+    rule = _RE_MD_PREFIX.sub('', rule)
+    rule = _RE_MD_SUFFIX.sub('', rule)
+
+    lines = rule.split('\n')
+
+    # Pass 1: minimum indentation (excluding empty lines, comments
+    # and the declaration line) and reordering safety
+    min_indent = float('inf')
+    reorder = True
+    for i, line in enumerate(lines):
+        if reorder and _RE_COMPLEX_STR.search(line):
+            # Braces inside strings/regexes would confuse the
+            # section grouping below, so keep line order as-is
+            reorder = False
+        if i == 0:
+            continue
+        stripped = line.strip()
+        if stripped and not stripped.startswith('//'):
+            indent = len(line) - len(line.lstrip())
+            if indent < min_indent:
+                min_indent = indent
+    if min_indent == float('inf'):
+        min_indent = 0
+
+    # Pass 2: dedent, fix syntax, and classify sections
+    rule_header = []
+    meta_lines = []
+    strings_lines = []
+    condition_lines = []
+    flat_lines = []
+    # One dict lookup on the token before ':' classifies a line,
+    # replacing three separate startswith scans
+    buckets = {
+        'meta': meta_lines,
+        'strings': strings_lines,
+        'condition': condition_lines,
+    }
+    current_bucket = None
+    brace_count = 0
+
+    for i, line in enumerate(lines):
+        # Remove common indentation (first line kept as-is)
+        if i:
+            if not line.strip():
+                line = ''
+            elif min_indent:
+                line = line[min_indent:]
+
+        # Per-line syntax fixes: declaration spacing, missing
+        # section colons, '$x=' spacing and quote normalization
+        line = _RE_RULE_DECL.sub(r'rule \1 {', line)
+        line = _RE_SECTION_NOCOLON_EOL.sub(r'\1:', line)
+        line = _RE_SECTION_NOCOLON_MID.sub(r'\1:', line)
+        if '$' in line:
+            line = _RE_DOLLAR_EQ.sub(r'$\1 =', line)
+            line = _RE_STRING_DEF_QUOTES.sub(r'\1"\2"', line)
+
+        if not reorder:
+            flat_lines.append(line)
+            continue
+
+        stripped = line.strip()
+
+        # Track rule header
+        if stripped.startswith('rule ') and '{' in stripped:
+            rule_header.append(line)
+            brace_count += line.count('{')
+            continue
+        elif not rule_header and not stripped:
+            continue
+        elif not rule_header:
+            rule_header.append(line)
+            continue
+
+        # Track braces for end of rule
+        brace_count += line.count('{') - line.count('}')
+        if brace_count <= 0 and '}' in line:
+            # End of rule (closing brace)
+            condition_lines.append(line)
+            break
+
+        # Determine section: a section header starts a new bucket,
+        # anything else joins the current one (or the header area)
+        head, sep, _ = stripped.partition(':')
+        bucket = buckets.get(head) if sep else None
+        if bucket is not None:
+            current_bucket = bucket
+            bucket.append(line)
+        elif current_bucket is not None:
+            current_bucket.append(line)
+        else:
+            # Default to rule header area
+            rule_header.append(line)
+
+    if not reorder:
+        return '\n'.join(flat_lines)
+
+    # Reconstruct rule in canonical section order
+    return '\n'.join(rule_header + meta_lines + strings_lines + condition_lines)
+
+
+def _validate_basic_structure(rule: str) -> bool:
+    """Validate basic YARA rule structure."""
+    # Use our more sophisticated validation
+    return _is_valid_rule_structure(rule)
+
+
+def extract_rules_bulk(responses: List[str]) -> List[List[str]]:
+    """Extract YARA rules from many responses in one call.
+
+    Patterns are compiled once at import, so looping costs no recompiles;
+    the win is the shared per-response memo, which collapses duplicate
+    responses (common when models repeat refusals) to a single parse.
+    """
+    return [extract_rules(response) for response in responses]
+
+
+def extract_single_rule(response: str) -> Optional[str]:
+    """Extract a single YARA rule from response (returns first valid rule).
+
+    Stops the lazy pipeline at the first valid rule instead of
+    extracting everything and discarding all but the head.
+    """
+    return next(_iter_rules(response), None)
+
+
+class YaraExtractor:
+    """Extract YARA rules from LLM-generated text.
+
+    Thin namespace over the module-level implementation, kept for the
+    existing call sites and import paths.
+    """
+
+    CODE_BLOCK_PATTERNS = CODE_BLOCK_PATTERNS
+    NO_RULE_INDICATORS = NO_RULE_INDICATORS
+
+    extract_rules = staticmethod(extract_rules)
+    extract_rules_bulk = staticmethod(extract_rules_bulk)
+    extract_single_rule = staticmethod(extract_single_rule)
+    _extract_rules_cached = staticmethod(_extract_rules_cached)
+    _indicates_no_rule = staticmethod(_indicates_no_rule)
+    _extract_rules_from_text = staticmethod(_extract_rules_from_text)
+    _extract_rule_manual_parsing = staticmethod(_extract_rule_manual_parsing)
+    _scan_rule = staticmethod(_scan_rule)
+    _is_valid_rule_structure = staticmethod(_is_valid_rule_structure)
+    _clean_rule = staticmethod(_clean_rule)
+    _validate_basic_structure = staticmethod(_validate_basic_structure)
@@ -2,11 +2,12 @@
 
 from .text_utils import clean_text_output, fix_base64_padding
 from .seed_generator import SeedGenerator
-from .data_utils import decode_base64_list
+from .data_utils import decode_base64, decode_base64_list
 
 __all__ = [
     "clean_text_output",
-    "fix_base64_padding", 
+    "fix_base64_padding",
     "SeedGenerator",
+    "decode_base64",
     "decode_base64_list"
 ]
\ No newline at end of file
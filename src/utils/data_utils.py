@@ -1,10 +1,42 @@
 """Data processing utilities."""
 
-import base64
+import re
 from typing import List
 
 from .text_utils import fix_base64_padding
 
+# pybase64 decodes with SIMD (2-4x stdlib throughput) when installed;
+# otherwise binascii.a2b_base64 is the C function base64.b64decode
+# wraps, minus the wrapper's per-call argument normalization
+try:
+    from pybase64 import b64decode as _b64decode
+except ImportError:
+    from binascii import a2b_base64 as _b64decode
+
+# Well-formed base64: only alphabet characters and correct length
+_CLEAN_B64 = re.compile(r'^[A-Za-z0-9+/]+={0,2}$')
+
+
+def decode_base64(b64_string: str) -> bytes:
+    """Decode a base64 string, repairing padding only when needed.
+
+    Well-formed input goes straight to the (possibly SIMD) decoder;
+    the Python-level cleanup in fix_base64_padding only runs for
+    strings that actually need repair.
+
+    Args:
+        b64_string: Base64-encoded string
+
+    Returns:
+        Decoded bytes
+
+    Raises:
+        Exception: If the string cannot be decoded even after repair
+    """
+    if len(b64_string) % 4 == 0 and _CLEAN_B64.match(b64_string):
+        return _b64decode(b64_string)
+    return _b64decode(fix_base64_padding(b64_string))
+
 
 def decode_base64_list(b64_list: List[str]) -> List[bytes]:
     """Decode a list of base64-encoded strings (with padding fixes).
@@ -15,12 +47,18 @@ def decode_base64_list(b64_list: List[str]) -> List[bytes]:
     Returns:
         List of decoded byte strings (skips invalid entries)
     """
-    decoded = []
-    for b64 in b64_list:
-        try:
-            fixed = fix_base64_padding(b64)
-            decoded.append(base64.b64decode(fixed))
-        except Exception:
-            # Skip invalid base64 strings
-            continue
-    return decoded
\ No newline at end of file
+    # Pre-sized slots avoid list growth; invalid entries stay None and
+    # are filtered out in one pass at the end
+    decoded: List = [None] * len(b64_list)
+    for i, b64 in enumerate(b64_list):
+        if len(b64) % 4 == 0 and _CLEAN_B64.match(b64):
+            # Well-formed input can't raise, so the common case skips
+            # both the repair pass and the exception frame
+            decoded[i] = _b64decode(b64)
+        else:
+            try:
+                decoded[i] = _b64decode(fix_base64_padding(b64))
+            except Exception:
+                # Skip entries that stay invalid even after repair
+                continue
+    return [data for data in decoded if data is not None]
\ No newline at end of file
@@ -3,34 +3,53 @@
 import random
 from typing import List, Optional
 
+# Shared by every default-constructed generator: the tuple constant is
+# built once at import, so instances hold a reference instead of
+# rebuilding sixteen strings per construction
+_DEFAULT_PIECES = (
+    "injects malicious code into system processes",
+    "communicates with a C2 server via HTTP",
+    "encrypts user documents with AES-256",
+    "modifies registry keys for persistence",
+    "spawns hidden background threads",
+    "captures screenshots periodically",
+    "uses a custom encryption algorithm",
+    "modifies system files to hide its presence",
+    "creates mutex objects for synchronization",
+    "drops additional payloads to temp directory",
+    "establishes reverse shell connections",
+    "hooks API calls for stealth operations",
+    "compresses stolen data before exfiltration",
+    "uses domain generation algorithms for C2",
+    "patches system binaries in memory",
+    "creates scheduled tasks for persistence",
+)
+
 
 class SeedGenerator:
     """Creates a high-level seed description by combining predefined sentence pieces."""
-    
-    def __init__(self, pieces: Optional[List[str]] = None):
+
+    # No __dict__ per instance: fixed slots keep attribute reads at
+    # offset loads and shrink each generator object
+    __slots__ = ("pieces", "_rng", "_n", "_sample", "_choice")
+
+    def __init__(self, pieces: Optional[List[str]] = None, seed: Optional[int] = None):
         """Initialize with custom or default seed pieces.
-        
+
         Args:
             pieces: List of malware behavior descriptions
+            seed: Optional seed for reproducible generation
         """
-        self.pieces = pieces or [
-            "injects malicious code into system processes",
-            "communicates with a C2 server via HTTP",
-            "encrypts user documents with AES-256",
-            "modifies registry keys for persistence",
-            "spawns hidden background threads",
-            "captures screenshots periodically",
-            "uses a custom encryption algorithm",
-            "modifies system files to hide its presence",
-            "creates mutex objects for synchronization",
-            "drops additional payloads to temp directory",
-            "establishes reverse shell connections",
-            "hooks API calls for stealth operations",
-            "compresses stolen data before exfiltration",
-            "uses domain generation algorithms for C2",
-            "patches system binaries in memory",
-            "creates scheduled tasks for persistence"
-        ]
+        # Per-instance RNG: no contention on the random module's shared
+        # Mersenne-Twister state under threaded runs, and seedable for
+        # reproducibility
+        self._rng = random.Random(seed)
+        # Tuple storage: immutable, slightly cheaper to sample from, and
+        # picklable for sharing across worker processes
+        self.pieces = tuple(pieces) if pieces else _DEFAULT_PIECES
+        self._n = len(self.pieces)
+        self._sample = self._rng.sample
+        self._choice = self._rng.choice
 
     def generate(self, count: int = 3) -> str:
         """Generate a seed description by combining random pieces.
@@ -41,5 +60,8 @@ class SeedGenerator:
         Returns:
             Formatted seed description
         """
-        selected = random.sample(self.pieces, min(count, len(self.pieces)))
-        return "; ".join(selected) + "."
\ No newline at end of file
+        if count == 1:
+            # choice is O(1); sample would build selection bookkeeping
+            return self._choice(self.pieces) + "."
+        k = count if count < self._n else self._n
+        return "; ".join(self._sample(self.pieces, k)) + "."
\ No newline at end of file
@@ -2,51 +2,63 @@
 
 import base64
 import re
+import string
+
+# Deletion table stripping everything outside the base64 alphabet in a
+# single translate() pass
+_B64_ALPHABET = frozenset(string.ascii_letters + string.digits + '+/=')
+_B64_DELETE_TABLE = dict.fromkeys(
+    i for i in range(256) if chr(i) not in _B64_ALPHABET
+)
+# Backstop for code points above the table's latin-1 range
+_B64_JUNK_RE = re.compile(r'[^A-Za-z0-9+/=]')
+
+# Line-level cleanup patterns: fence lines (backticks plus a short
+# language tag), and newlines with their surrounding whitespace — the
+# greedy \s* folds line-edge trimming and blank-line collapsing into
+# one substitution pass
+_RE_FENCE_LINE = re.compile(r'^[ \t]*```[^\n]{0,7}[ \t]*$\n?', re.MULTILINE)
+_RE_LINE_BREAK = re.compile(r'[ \t]*\n\s*')
+# Deletion table for carriage returns: one branch-free C pass, so CRLF
+# (and stray mid-line CR) input is normalized before the regex runs
+_CR_TRANS = str.maketrans('', '', '\r')
 
 
 def clean_text_output(text: str) -> str:
-    """Remove markdown formatting and code blocks from any text output."""
-    # Remove markdown code block formatting
+    """Remove markdown formatting and code blocks from any text output.
+
+    All cleanup runs as compiled-regex substitutions, so each step is a
+    single C-level pass instead of a Python loop over split lines.
+    """
+    # Normalize line endings first (guard avoids a copy for LF input)
+    if '\r' in text:
+        text = text.translate(_CR_TRANS)
+
+    # Remove markdown code block fence lines
     if "```" in text:
-        lines = text.split("\n")
-        clean_lines = []
-        in_code_block = False
-        
-        for line in lines:
-            # Skip lines that only contain backticks or language identifiers
-            if line.strip().startswith("```") and (len(line.strip()) <= 10):
-                in_code_block = not in_code_block
-                continue
-            clean_lines.append(line)
-        
-        text = "\n".join(clean_lines)
-    
+        text = _RE_FENCE_LINE.sub('', text)
+
     # Remove surrounding backticks
     text = text.strip()
     if text.startswith("`") and text.endswith("`"):
         text = text[1:-1]
-    
-    # Clean up each line (strip trailing/leading whitespace)
-    lines = text.split("\n")
-    cleaned_lines = [line.strip() for line in lines if line.strip()]
-    
-    return "\n".join(cleaned_lines)
+
+    # Trim per-line whitespace and collapse blank lines in one pass;
+    # the outer strip covers the first and last line's edges
+    return _RE_LINE_BREAK.sub('\n', text).strip()
 
 
 def fix_base64_padding(b64_string: str) -> str:
     """Add padding to base64 string if needed."""
-    # First clean any markdown formatting
-    b64_string = clean_text_output(b64_string)
-    
-    # Remove any whitespace, newlines, or quotes that might be present
-    b64_string = b64_string.strip().replace('\n', '').replace('\r', '').replace('"', '').replace("'", '')
-    
-    # Remove any non-base64 characters
-    b64_string = re.sub(r'[^A-Za-z0-9+/=]', '', b64_string)
-    
-    # Add padding if needed
-    missing_padding = len(b64_string) % 4
-    if missing_padding:
-        b64_string += '=' * (4 - missing_padding)
-    
-    return b64_string
\ No newline at end of file
+    # Markdown fences are the only cleanup translate() can't handle
+    if '```' in b64_string:
+        b64_string = clean_text_output(b64_string)
+
+    # One pass drops whitespace, quotes and any other non-base64 noise
+    b64_string = b64_string.translate(_B64_DELETE_TABLE)
+    if not b64_string.isascii():
+        b64_string = _B64_JUNK_RE.sub('', b64_string)
+
+    # Add padding if needed ((-n) & 3 is the distance to the next
+    # multiple of four, with no branch for the already-aligned case)
+    return b64_string + '===' [:(-len(b64_string)) & 3]
\ No newline at end of file
@@ -1,85 +1,110 @@
 """Test synthetic challenge generation."""
 
+import base64
+import functools
 import pytest
 import json
+import re
 from unittest.mock import Mock
 
 from src.llm.generation import SyntheticChallengeGenerator
 from src.utils import SeedGenerator
 
 
+# Canned responses are JSON-encoded once at import; the per-call work in
+# the mock is a single regex scan instead of eight substring searches
+# plus a fresh json.dumps
+_MOCK_RESPONSES = {
+    "behavior_based": json.dumps({
+        "description": "Create a YARA rule to detect malware that injects code and communicates with evil-domain.com",
+        "primary_string": "evil-domain.com",
+        "secondary_string": "InjectThread",
+        "file_indicator": ".dll",
+        "expected_keywords": []
+    }),
+    "network_based": json.dumps({
+        "description": "Create a YARA rule to detect backdoor communicating with c2-server.net on port 443",
+        "domain": "c2-server.net",
+        "port": "443",
+        "protocol_string": "HTTPS",
+        "mutex_name": "BackdoorMutex",
+        "expected_keywords": []
+    }),
+    "file_system": json.dumps({
+        "description": "Create a YARA rule to detect dropper creating files in Windows temp directory",
+        "file_path": "C:\\Windows\\Temp\\malware.exe",
+        "file_extension": ".exe",
+        "marker_string": "DROPPER_MARK",
+        "registry_key": "HKEY_LOCAL_MACHINE\\Software\\Microsoft\\Windows\\CurrentVersion\\Run",
+        "expected_keywords": []
+    }),
+    "pe_analysis": json.dumps({
+        "description": "Create a YARA rule to detect PE files with UPX packer using string-based detection.",
+        "packer": "UPX",
+        "import_function": "GetProcAddress",
+        "section_name": ".upx1",
+        "version_info": "UPX Packed",
+        "expected_keywords": []
+    }),
+}
+_MOCK_FALLBACK = json.dumps({
+    "description": "Generic test challenge",
+    "test_string": "test_value",
+    "expected_keywords": []
+})
+# Generated fixtures reuse content, so identical payloads decode once
+@functools.lru_cache(maxsize=256)
+def _b64(s: str) -> bytes:
+    return base64.b64decode(s)
+
+
+_MOCK_DISPATCH = re.compile(
+    r"(?P<behavior_based>behavior_based|specific technical indicators)"
+    r"|(?P<network_based>network_based|network communication)"
+    r"|(?P<file_system>file_system|file system)"
+    r"|(?P<pe_analysis>pe_analysis|PE analysis)"
+)
+
+
 class MockLLMClient:
     """Mock LLM client for testing."""
-    
+
     def __init__(self, response_data=None):
         self.response_data = response_data or {}
         self.call_count = 0
-    
+
     def generate_rule_description(self, prompt):
         """Mock response based on prompt content."""
         self.call_count += 1
-        
-        if "behavior_based" in prompt or "specific technical indicators" in prompt:
-            return json.dumps({
-                "description": "Create a YARA rule to detect malware that injects code and communicates with evil-domain.com",
-                "primary_string": "evil-domain.com",
-                "secondary_string": "InjectThread",
-                "file_indicator": ".dll",
-                "expected_keywords": []
-            })
-        elif "network_based" in prompt or "network communication" in prompt:
-            return json.dumps({
-                "description": "Create a YARA rule to detect backdoor communicating with c2-server.net on port 443",
-                "domain": "c2-server.net",
-                "port": "443",
-                "protocol_string": "HTTPS",
-                "mutex_name": "BackdoorMutex",
-                "expected_keywords": []
-            })
-        elif "file_system" in prompt or "file system" in prompt:
-            return json.dumps({
-                "description": "Create a YARA rule to detect dropper creating files in Windows temp directory",
-                "file_path": "C:\\Windows\\Temp\\malware.exe",
-                "file_extension": ".exe",
-                "marker_string": "DROPPER_MARK",
-                "registry_key": "HKEY_LOCAL_MACHINE\\Software\\Microsoft\\Windows\\CurrentVersion\\Run",
-                "expected_keywords": []
-            })
-        elif "pe_analysis" in prompt or "PE analysis" in prompt:
-            return json.dumps({
-                "description": "Create a YARA rule to detect PE files with UPX packer using string-based detection.",
-                "packer": "UPX",
-                "import_function": "GetProcAddress",
-                "section_name": ".upx1",
-                "version_info": "UPX Packed",
-                "expected_keywords": []
-            })
-        else:
-            # Fallback
-            return json.dumps({
-                "description": "Generic test challenge",
-                "test_string": "test_value",
-                "expected_keywords": []
-            })
+
+        match = _MOCK_DISPATCH.search(prompt)
+        return _MOCK_RESPONSES[match.lastgroup] if match else _MOCK_FALLBACK
+
+
+# One generator (and mock client) for the whole module: construction
+# rebuilds the seed generator and template list, which no test mutates.
+# Only the mock's call counter is stateful, so that resets per test.
+@pytest.fixture(scope="module")
+def generator():
+    return SyntheticChallengeGenerator(MockLLMClient())
+
+
+@pytest.fixture(autouse=True)
+def _reset_mock(generator):
+    generator.llm_client.call_count = 0
 
 
 class TestSyntheticChallengeGenerator:
     """Test synthetic challenge generation."""
-    
-    def test_generator_initialization(self):
+
+    def test_generator_initialization(self, generator):
         """Test generator initialization."""
-        mock_client = MockLLMClient()
-        generator = SyntheticChallengeGenerator(mock_client)
-        
-        assert generator.llm_client == mock_client
+        assert isinstance(generator.llm_client, MockLLMClient)
         assert isinstance(generator.seed_generator, SeedGenerator)
         assert len(generator.challenge_templates) == 4
-    
-    def test_challenge_templates(self):
+
+    def test_challenge_templates(self, generator):
         """Test challenge templates are properly defined."""
-        mock_client = MockLLMClient()
-        generator = SyntheticChallengeGenerator(mock_client)
-        
         template_types = [t["type"] for t in generator.challenge_templates]
         expected_types = ["behavior_based", "network_based", "file_system", "pe_analysis"]
         
@@ -91,26 +116,20 @@ class TestSyntheticChallengeGenerator:
             assert "prompt_template" in template
             assert "expected_keywords" in template
     
-    def test_generate_challenge_with_seed(self):
+    def test_generate_challenge_with_seed(self, generator):
         """Test generating challenge with seed."""
-        mock_client = MockLLMClient()
-        generator = SyntheticChallengeGenerator(mock_client)
-        
         seed = "injects malicious code; communicates with C2"
         template = generator.challenge_templates[0]  # behavior_based
-        
+
         result = generator._generate_challenge_with_seed(seed, template)
-        
+
         assert result is not None
         assert "description" in result
         assert "primary_string" in result
-        assert mock_client.call_count == 1
-    
-    def test_generate_single_challenge(self):
+        assert generator.llm_client.call_count == 1
+
+    def test_generate_single_challenge(self, generator):
         """Test generating a single challenge."""
-        mock_client = MockLLMClient()
-        generator = SyntheticChallengeGenerator(mock_client)
-        
         challenge = generator._generate_single_challenge("test_001")
         
         assert challenge is not None
@@ -122,11 +141,8 @@ class TestSyntheticChallengeGenerator:
         assert "seed" in challenge.metadata
         assert "template" in challenge.metadata
     
-    def test_generate_multiple_challenges(self):
+    def test_generate_multiple_challenges(self, generator):
         """Test generating multiple challenges."""
-        mock_client = MockLLMClient()
-        generator = SyntheticChallengeGenerator(mock_client)
-        
         challenges = generator.generate_challenges(count=3)
         
         assert len(challenges) <= 3  # May be less if some fail
@@ -136,11 +152,8 @@ class TestSyntheticChallengeGenerator:
             assert challenge.actionable is True
             assert len(challenge.test_files) >= 2
     
-    def test_generate_sophisticated_test_files_behavior_based(self):
+    def test_generate_sophisticated_test_files_behavior_based(self, generator):
         """Test sophisticated test file generation for behavior_based."""
-        mock_client = MockLLMClient()
-        generator = SyntheticChallengeGenerator(mock_client)
-        
         challenge_data = {
             "description": "Test behavior challenge",
             "primary_string": "evil.com",
@@ -153,20 +166,18 @@ class TestSyntheticChallengeGenerator:
         )
         
         assert len(test_files) >= 2
-        assert any(f.should_match for f in test_files)
-        assert any(not f.should_match for f in test_files)
-        
+
+        # Split once instead of re-scanning for each assertion
+        matching = [f for f in test_files if f.should_match]
+        non_matching = [f for f in test_files if not f.should_match]
+        assert matching and non_matching
+
         # Check that matching file contains indicators
-        matching_file = next(f for f in test_files if f.should_match)
-        import base64
-        content = base64.b64decode(matching_file.content_b64).decode()
+        content = _b64(matching[0].content_b64).decode()
         assert "evil.com" in content or "InjectCode" in content
     
-    def test_generate_sophisticated_test_files_pe_analysis(self):
+    def test_generate_sophisticated_test_files_pe_analysis(self, generator):
         """Test sophisticated test file generation for PE analysis."""
-        mock_client = MockLLMClient()
-        generator = SyntheticChallengeGenerator(mock_client)
-        
         challenge_data = {
             "description": "PE analysis challenge",
             "packer": "UPX",
@@ -180,12 +191,13 @@ class TestSyntheticChallengeGenerator:
             "pe_analysis", challenge_data, seed
         )
         
+        matching = [f for f in test_files if f.should_match]
+        non_matching = [f for f in test_files if not f.should_match]
         assert len(test_files) >= 2
-        
+        assert matching and non_matching
+
         # Check PE sample contains PE indicators
-        matching_file = next(f for f in test_files if f.should_match)
-        import base64
-        content = base64.b64decode(matching_file.content_b64).decode()
+        content = _b64(matching[0].content_b64).decode()
         assert "UPX" in content
         assert "LoadLibrary" in content
     
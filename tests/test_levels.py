@@ -1,7 +1,6 @@
 """Test challenge levels."""
 
 import pytest
-import tempfile
 import json
 from pathlib import Path
 from unittest.mock import Mock
@@ -9,6 +8,24 @@ from unittest.mock import Mock
 from src.levels import Level1, Level2
 from src.models import Challenge, ChallengeLevel, TestFile
 
+# The valid-challenge payload never varies, so it is serialized once at
+# import instead of being rebuilt and re-encoded inside the test body
+_CHALLENGE_JSON = json.dumps({
+    "id": "test_001",
+    "level": "level1",
+    "actionable": True,
+    "description": "Test challenge",
+    "expected_strings": ["test"],
+    "expected_keywords": [],
+    "test_files": [
+        {
+            "name": "test.txt",
+            "content_b64": "dGVzdA==",  # "test" in base64
+            "should_match": True
+        }
+    ]
+})
+
 
 class TestLevel1:
     """Test Level 1 static challenges."""
@@ -30,46 +47,26 @@ class TestLevel1:
         challenges = level1.get_challenges()
         assert challenges == []
     
-    def test_level1_with_valid_data(self):
+    def test_level1_with_valid_data(self, tmp_path):
         """Test Level1 with valid challenge data."""
-        # Create temporary directory with test challenge
-        with tempfile.TemporaryDirectory() as temp_dir:
-            challenge_data = {
-                "id": "test_001",
-                "level": "level1",
-                "actionable": True,
-                "description": "Test challenge",
-                "expected_strings": ["test"],
-                "expected_keywords": [],
-                "test_files": [
-                    {
-                        "name": "test.txt",
-                        "content_b64": "dGVzdA==",  # "test" in base64
-                        "should_match": True
-                    }
-                ]
-            }
-            
-            # Create level1 subdirectory
-            level1_dir = Path(temp_dir) / "level1"
-            level1_dir.mkdir(exist_ok=True)
-            
-            # Write challenge file
-            challenge_file = level1_dir / "test_001.json"
-            with open(challenge_file, 'w') as f:
-                json.dump(challenge_data, f)
-            
-            # Test Level1 with this data
-            level1 = Level1(data_dir=temp_dir)
-            assert level1.validate()
-            
-            challenges = level1.get_challenges()
-            assert len(challenges) == 1
-            
-            challenge = challenges[0]
-            assert challenge.id == "test_001"
-            assert challenge.actionable is True
-            assert len(challenge.test_files) == 1
+        # Create level1 subdirectory
+        level1_dir = tmp_path / "level1"
+        level1_dir.mkdir(exist_ok=True)
+
+        # Write challenge file
+        (level1_dir / "test_001.json").write_text(_CHALLENGE_JSON)
+
+        # Test Level1 with this data
+        level1 = Level1(data_dir=str(tmp_path))
+        assert level1.validate()
+
+        challenges = level1.get_challenges()
+        assert len(challenges) == 1
+
+        challenge = challenges[0]
+        assert challenge.id == "test_001"
+        assert challenge.actionable is True
+        assert len(challenge.test_files) == 1
 
 
 class TestLevel2:
@@ -13,57 +13,95 @@ class MockLLMClient:
     
     def __init__(self, judge_response=None):
         self.judge_response = judge_response
+        # Resolved once so each call is a plain attribute read
+        self._response = judge_response or _DEFAULT_JUDGE_RESPONSE
         self.call_count = 0
-    
+
     def generate_rule_description(self, prompt):
         """Return mock judge evaluation."""
         self.call_count += 1
-        
-        if self.judge_response:
-            return self.judge_response
-        
-        # Default response
-        return json.dumps({
-            "correctness": {
-                "score": 8,
-                "feedback": "Rule correctly implements the requirements"
-            },
-            "completeness": {
-                "score": 9,
-                "feedback": "All required strings are present"
-            },
-            "efficiency": {
-                "score": 7,
-                "feedback": "Rule is reasonably efficient"
-            },
-            "best_practices": {
-                "score": 8,
-                "feedback": "Follows most YARA conventions"
-            },
-            "false_positive_risk": {
-                "score": 6,
-                "feedback": "Moderate risk of false positives"
-            },
-            "overall_assessment": "Good rule implementation with minor improvements possible"
-        })
+        return self._response
+
+
+# Encoded once at import; the default judge verdict never varies per call
+_DEFAULT_JUDGE_RESPONSE = json.dumps({
+    "correctness": {
+        "score": 8,
+        "feedback": "Rule correctly implements the requirements"
+    },
+    "completeness": {
+        "score": 9,
+        "feedback": "All required strings are present"
+    },
+    "efficiency": {
+        "score": 7,
+        "feedback": "Rule is reasonably efficient"
+    },
+    "best_practices": {
+        "score": 8,
+        "feedback": "Follows most YARA conventions"
+    },
+    "false_positive_risk": {
+        "score": 6,
+        "feedback": "Moderate risk of false positives"
+    },
+    "overall_assessment": "Good rule implementation with minor improvements possible"
+})
+
+_POOR_JUDGE_RESPONSE = json.dumps({
+    "correctness": {"score": 3, "feedback": "Incorrect implementation"},
+    "completeness": {"score": 2, "feedback": "Missing required strings"},
+    "efficiency": {"score": 5, "feedback": "Average efficiency"},
+    "best_practices": {"score": 4, "feedback": "Poor conventions"},
+    "false_positive_risk": {"score": 2, "feedback": "High false positive risk"},
+    "overall_assessment": "Poor rule implementation"
+})
+
+_PARTIAL_JUDGE_RESPONSE = json.dumps({
+    "correctness": {"score": 8},  # Missing feedback
+    "completeness": 7,  # Not a dict
+    # Missing other criteria
+})
+
+
+# Judge construction is pure setup, so tests that only need the default
+# mock verdict share one module-scoped judge; the mock's call counter is
+# the only mutable state and resets per test
+@pytest.fixture(scope="module")
+def judge():
+    return LLMJudge(MockLLMClient())
+
+
+@pytest.fixture(autouse=True)
+def _reset_mock(judge):
+    judge.llm_client.call_count = 0
+
+
+# The bare "Test challenge" the negative-path tests evaluate against is
+# identical everywhere, so it validates once per module instead of per test
+@pytest.fixture(scope="module")
+def empty_challenge():
+    return Challenge(
+        id="test",
+        level=ChallengeLevel.LEVEL1,
+        actionable=True,
+        description="Test challenge",
+        expected_strings=[],
+        expected_keywords=[],
+        test_files=[]
+    )
 
 
 class TestLLMJudge:
     """Test LLM judge functionality."""
-    
-    def test_judge_initialization(self):
+
+    def test_judge_initialization(self, judge):
         """Test judge initialization."""
-        mock_client = MockLLMClient()
-        judge = LLMJudge(mock_client)
-        
-        assert judge.llm_client == mock_client
+        assert isinstance(judge.llm_client, MockLLMClient)
         assert judge.name == "LLM Judge"
-    
-    def test_judge_evaluation_success(self):
+
+    def test_judge_evaluation_success(self, judge):
         """Test successful judge evaluation."""
-        mock_client = MockLLMClient()
-        judge = LLMJudge(mock_client)
-        
         # Create test challenge and rule
         challenge = Challenge(
             id="test_001",
@@ -101,39 +139,20 @@ class TestLLMJudge:
         
         # Check details
         assert "correctness" in result["llm_judge_details"]
-        assert mock_client.call_count == 1
+        assert judge.llm_client.call_count == 1
     
-    def test_judge_evaluation_with_custom_response(self):
+    def test_judge_evaluation_with_custom_response(self, empty_challenge):
         """Test judge evaluation with custom response."""
-        custom_response = json.dumps({
-            "correctness": {"score": 3, "feedback": "Incorrect implementation"},
-            "completeness": {"score": 2, "feedback": "Missing required strings"},
-            "efficiency": {"score": 5, "feedback": "Average efficiency"},
-            "best_practices": {"score": 4, "feedback": "Poor conventions"},
-            "false_positive_risk": {"score": 2, "feedback": "High false positive risk"},
-            "overall_assessment": "Poor rule implementation"
-        })
-        
-        mock_client = MockLLMClient(judge_response=custom_response)
+        mock_client = MockLLMClient(judge_response=_POOR_JUDGE_RESPONSE)
         judge = LLMJudge(mock_client)
         
-        challenge = Challenge(
-            id="test_002",
-            level=ChallengeLevel.LEVEL1,
-            actionable=True,
-            description="Test challenge",
-            expected_strings=[],
-            expected_keywords=[],
-            test_files=[]
-        )
-        
-        result = judge.evaluate(challenge, "rule BadRule { condition: true }")
+        result = judge.evaluate(empty_challenge, "rule BadRule { condition: true }")
         
         # Should get low score
         assert result["llm_judge_score"] < 0.4
         assert "Poor rule implementation" in result["llm_judge_feedback"]
     
-    def test_judge_evaluation_error_handling(self):
+    def test_judge_evaluation_error_handling(self, empty_challenge):
         """Test judge evaluation error handling."""
         class ErrorClient:
             def generate_rule_description(self, prompt):
@@ -141,86 +160,40 @@ class TestLLMJudge:
         
         judge = LLMJudge(ErrorClient())
         
-        challenge = Challenge(
-            id="test_003",
-            level=ChallengeLevel.LEVEL1,
-            actionable=True,
-            description="Test challenge",
-            expected_strings=[],
-            expected_keywords=[],
-            test_files=[]
-        )
-        
-        result = judge.evaluate(challenge, "rule Test { condition: true }")
+        result = judge.evaluate(empty_challenge, "rule Test { condition: true }")
         
         assert result["llm_judge_score"] == 0.0
         assert "LLM judge error" in result["llm_judge_feedback"]
         assert "error" in result["llm_judge_details"]
     
-    def test_judge_evaluation_malformed_json(self):
+    def test_judge_evaluation_malformed_json(self, empty_challenge):
         """Test judge evaluation with malformed JSON response."""
         mock_client = MockLLMClient(judge_response="This is not JSON")
         judge = LLMJudge(mock_client)
         
-        challenge = Challenge(
-            id="test_004",
-            level=ChallengeLevel.LEVEL1,
-            actionable=True,
-            description="Test challenge",
-            expected_strings=[],
-            expected_keywords=[],
-            test_files=[]
-        )
-        
-        result = judge.evaluate(challenge, "rule Test { condition: true }")
+        result = judge.evaluate(empty_challenge, "rule Test { condition: true }")
         
         # Should handle gracefully
         assert "llm_judge_score" in result
         assert "llm_judge_feedback" in result
         assert result["llm_judge_score"] == 0.5  # Default middle score
     
-    def test_judge_evaluation_partial_response(self):
+    def test_judge_evaluation_partial_response(self, empty_challenge):
         """Test judge evaluation with partial response."""
-        partial_response = json.dumps({
-            "correctness": {"score": 8},  # Missing feedback
-            "completeness": 7,  # Not a dict
-            # Missing other criteria
-        })
-        
-        mock_client = MockLLMClient(judge_response=partial_response)
+        mock_client = MockLLMClient(judge_response=_PARTIAL_JUDGE_RESPONSE)
         judge = LLMJudge(mock_client)
         
-        challenge = Challenge(
-            id="test_005",
-            level=ChallengeLevel.LEVEL1,
-            actionable=True,
-            description="Test challenge",
-            expected_strings=[],
-            expected_keywords=[],
-            test_files=[]
-        )
-        
-        result = judge.evaluate(challenge, "rule Test { condition: true }")
+        result = judge.evaluate(empty_challenge, "rule Test { condition: true }")
         
         # Should handle gracefully with defaults
         assert "llm_judge_score" in result
         assert 0.0 <= result["llm_judge_score"] <= 1.0
     
-    def test_judge_evaluation_no_client(self):
+    def test_judge_evaluation_no_client(self, empty_challenge):
         """Test judge evaluation without LLM client."""
         judge = LLMJudge(None)
         
-        challenge = Challenge(
-            id="test_006",
-            level=ChallengeLevel.LEVEL1,
-            actionable=True,
-            description="Test challenge",
-            expected_strings=[],
-            expected_keywords=[],
-            test_files=[]
-        )
-        
-        result = judge.evaluate(challenge, "rule Test { condition: true }")
+        result = judge.evaluate(empty_challenge, "rule Test { condition: true }")
         
         assert result["llm_judge_score"] == 0.0
         assert "not configured" in result["llm_judge_feedback"]
@@ -4,15 +4,20 @@ import pytest
 import base64
 from src.models import Challenge, TestFile, ChallengeLevel, ModelConfig, Config
 
+# Fixture payloads encoded once at import instead of per test
+_TEST_CONTENT_B64 = base64.b64encode(b"test content").decode()
+_MALICIOUS_CONTENT_B64 = base64.b64encode(b"malicious content").decode()
+_BENIGN_CONTENT_B64 = base64.b64encode(b"benign content").decode()
+
 
 def test_test_file_creation():
     """Test TestFile model creation and validation."""
     test_file = TestFile(
         name="test.exe",
-        content_b64=base64.b64encode(b"test content").decode(),
+        content_b64=_TEST_CONTENT_B64,
         should_match=True
     )
-    
+
     assert test_file.name == "test.exe"
     assert test_file.should_match is True
     assert base64.b64decode(test_file.content_b64) == b"test content"
@@ -23,12 +28,12 @@ def test_challenge_creation():
     test_files = [
         TestFile(
             name="malware.exe",
-            content_b64=base64.b64encode(b"malicious content").decode(),
+            content_b64=_MALICIOUS_CONTENT_B64,
             should_match=True
         ),
         TestFile(
-            name="benign.exe", 
-            content_b64=base64.b64encode(b"benign content").decode(),
+            name="benign.exe",
+            content_b64=_BENIGN_CONTENT_B64,
             should_match=False
         )
     ]
@@ -4,32 +4,108 @@ import pytest
 from src.parsing import YaraExtractor
 
 
-class TestYaraExtractor:
-    """Test YARA rule extraction functionality."""
-    
-    def test_extract_simple_rule(self):
-        """Test extracting a simple YARA rule."""
-        text = """
+# Single-rule extraction cases share one shape (exactly one rule out,
+# required fragments present), so they run as parametrized cases of one
+# test and can be sharded individually under xdist
+SINGLE_RULE_CASES = [
+    pytest.param(
+        """
         Here is a YARA rule:
-        
+
         rule TestRule {
             strings:
                 $a = "malicious"
             condition:
                 $a
         }
-        
+
         That's the rule.
+        """,
+        ["rule TestRule", "malicious", "condition:"],
+        id="simple",
+    ),
+    pytest.param(
         """
-        
+        rule ComplexRule {
+            meta:
+                description = "Test rule"
+                author = "YaraBench"
+            strings:
+                $str = "suspicious"
+            condition:
+                $str
+        }
+        """,
+        ["meta:", "description", "author", "suspicious"],
+        id="meta",
+    ),
+    pytest.param(
+        """
+        import "cuckoo"
+
+        rule ImportRule {
+            condition:
+                cuckoo.network.http_request(/evil\.com/)
+        }
+        """,
+        ["rule ImportRule", "cuckoo.network", 'import "cuckoo"'],
+        id="imports",
+    ),
+    pytest.param(
+        """
+        rule NestedBraces {
+            strings:
+                $regex = /function\\s*\\{[^}]*\\}/
+                $str = "data {content}"
+            condition:
+                any of them
+        }
+        """,
+        ["NestedBraces", "function", "data {content}"],
+        id="nested-braces",
+    ),
+    pytest.param(
+        """
+        rule CommentedRule {
+            strings:
+                $a = "test" // This is a comment
+                /* Multi-line
+                   comment */
+                $b = "another"
+            condition:
+                $a or $b
+        }
+        """,
+        ["CommentedRule", "test", "another"],
+        id="comments",
+    ),
+]
+
+
+class TestYaraExtractor:
+    """Test YARA rule extraction functionality."""
+
+    @pytest.mark.parametrize("text,must_contain", SINGLE_RULE_CASES)
+    def test_extract_single_rule_variants(self, text, must_contain):
+        """Test extracting exactly one rule from assorted layouts."""
         rules = YaraExtractor.extract_rules(text)
         assert len(rules) == 1
-        
+
         rule = rules[0]
-        assert "rule TestRule" in rule
-        assert "malicious" in rule
-        assert "condition:" in rule
-    
+        for fragment in must_contain:
+            assert fragment in rule
+
+    def test_extract_rules_bulk(self):
+        """Test bulk extraction matches per-text extraction."""
+        texts = [case.values[0] for case in SINGLE_RULE_CASES]
+        texts.append("This text has no YARA rules in it.")
+
+        results = YaraExtractor.extract_rules_bulk(texts)
+
+        assert len(results) == len(texts)
+        for text, rules in zip(texts, results):
+            assert rules == YaraExtractor.extract_rules(text)
+
     def test_extract_multiple_rules(self):
         """Test extracting multiple YARA rules."""
         text = """
@@ -58,49 +134,6 @@ class TestYaraExtractor:
         assert "Rule2" in rules[1] 
         assert "test2" in rules[1]
     
-    def test_extract_rule_with_meta(self):
-        """Test extracting rule with meta section."""
-        text = """
-        rule ComplexRule {
-            meta:
-                description = "Test rule"
-                author = "YaraBench"
-            strings:
-                $str = "suspicious"
-            condition:
-                $str
-        }
-        """
-        
-        rules = YaraExtractor.extract_rules(text)
-        assert len(rules) == 1
-        
-        rule = rules[0]
-        assert "meta:" in rule
-        assert "description" in rule
-        assert "author" in rule
-        assert "suspicious" in rule
-    
-    def test_extract_rule_with_imports(self):
-        """Test extracting rule with imports."""
-        text = """
-        import "cuckoo"
-        
-        rule ImportRule {
-            condition:
-                cuckoo.network.http_request(/evil\.com/)
-        }
-        """
-        
-        rules = YaraExtractor.extract_rules(text)
-        assert len(rules) == 1
-        
-        rule = rules[0]
-        assert "rule ImportRule" in rule
-        assert "cuckoo.network" in rule
-        # Import should be included
-        assert 'import "cuckoo"' in rule
-    
     def test_extract_single_rule(self):
         """Test extracting single rule from multiple."""
         text = """
@@ -137,48 +170,6 @@ class TestYaraExtractor:
         # Behavior depends on regex patterns - might extract partial rule
         assert isinstance(rules, list)
     
-    def test_extract_rule_with_nested_braces(self):
-        """Test extracting rule with nested braces in strings."""
-        text = """
-        rule NestedBraces {
-            strings:
-                $regex = /function\\s*\\{[^}]*\\}/
-                $str = "data {content}"
-            condition:
-                any of them
-        }
-        """
-        
-        rules = YaraExtractor.extract_rules(text)
-        assert len(rules) == 1
-        
-        rule = rules[0]
-        assert "NestedBraces" in rule
-        assert "function" in rule
-        assert "data {content}" in rule
-    
-    def test_extract_rule_with_comments(self):
-        """Test extracting rule with comments."""
-        text = """
-        rule CommentedRule {
-            strings:
-                $a = "test" // This is a comment
-                /* Multi-line
-                   comment */
-                $b = "another"
-            condition:
-                $a or $b
-        }
-        """
-        
-        rules = YaraExtractor.extract_rules(text)
-        assert len(rules) == 1
-        
-        rule = rules[0]
-        assert "CommentedRule" in rule
-        assert "test" in rule
-        assert "another" in rule
-    
     def test_duplicate_detection(self):
         """Test duplicate rule detection."""
         text = """
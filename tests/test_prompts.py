@@ -0,0 +1,64 @@
+"""Test prompt construction and batch packing."""
+
+import pytest
+
+from src.llm.prompts import pack_batch, system_prompt_tokens
+from src.models import Challenge, ChallengeLevel
+
+
+def _challenge(i, description="Detect test malware"):
+    return Challenge(
+        id=f"pack_{i:03d}",
+        level=ChallengeLevel.LEVEL1,
+        actionable=True,
+        description=description,
+        expected_strings=["test"],
+        expected_keywords=[],
+        test_files=[]
+    )
+
+
+class TestPackBatch:
+    """Test token-budget batch packing."""
+
+    def test_pack_batch_preserves_order_and_coverage(self):
+        """Every challenge lands in exactly one batch, in order."""
+        challenges = [_challenge(i) for i in range(7)]
+
+        batches = list(pack_batch(challenges, "test-model", max_tokens=128000))
+
+        packed = [c for batch in batches for c in batch]
+        assert packed == challenges
+
+    def test_pack_batch_splits_on_token_budget(self):
+        """A tight context window forces multiple batches."""
+        challenges = [_challenge(i) for i in range(6)]
+        budget = system_prompt_tokens("test-model") + 300
+
+        batches = list(pack_batch(
+            challenges, "test-model", max_tokens=budget, max_completion=100
+        ))
+
+        assert len(batches) > 1
+        assert [c for batch in batches for c in batch] == challenges
+
+    def test_pack_batch_respects_max_count(self):
+        """max_count caps batch size even with budget to spare."""
+        challenges = [_challenge(i) for i in range(5)]
+
+        batches = list(pack_batch(
+            challenges, "test-model", max_tokens=128000, max_count=2
+        ))
+
+        assert [len(batch) for batch in batches] == [2, 2, 1]
+
+    def test_pack_batch_oversized_challenge_yielded_alone(self):
+        """A challenge over budget by itself is not dropped."""
+        challenges = [_challenge(0, description="x" * 5000), _challenge(1)]
+
+        batches = list(pack_batch(
+            challenges, "test-model", max_tokens=system_prompt_tokens("test-model") + 200
+        ))
+
+        assert [c for batch in batches for c in batch] == challenges
+        assert batches[0][0].id == "pack_000"
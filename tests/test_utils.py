@@ -19,7 +19,8 @@ class TestSeedGenerator:
         """Test SeedGenerator with custom pieces."""
         custom_pieces = ["behavior 1", "behavior 2", "behavior 3"]
         generator = SeedGenerator(custom_pieces)
-        assert generator.pieces == custom_pieces
+        # Pieces are stored as an immutable tuple
+        assert generator.pieces == tuple(custom_pieces)
     
     def test_generate_single_behavior(self):
         """Test generating single behavior."""